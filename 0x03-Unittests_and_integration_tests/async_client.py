@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""An asyncio github org client for many orgs at once, paced by
+the API's rate-limit headers.
+"""
+import asyncio
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from requests.utils import parse_header_links
+
+from client import GithubOrgClient, LicenseIndex, Repo, page_urls
+from utils import DEFAULT_TIMEOUT, get_session
+
+__all__ = [
+    "AsyncGithubOrgClient",
+    "RateLimiter",
+    "RateLimitExceeded",
+    "fetch_public_repos",
+]
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is still rate limited after every retry"""
+
+
+def request(url: str) -> Tuple[int, Mapping[str, str], Any]:
+    """Blocking GET on the shared session: status, headers, JSON"""
+    response = get_session().get(url, timeout=DEFAULT_TIMEOUT)
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = None
+    return response.status_code, response.headers, payload
+
+
+def is_rate_limit_message(payload: Any) -> bool:
+    """True for GitHub's rate-limit error bodies. A secondary rate
+    limit comes as a 403 with X-RateLimit-Remaining left and, at
+    times, no Retry-After: only the message tells it apart.
+    """
+    if not isinstance(payload, Mapping):
+        return False
+    return "rate limit" in str(payload.get("message", "")).lower()
+
+
+class RateLimiter:
+    """Spreads requests over the rate-limit window.
+    The X-RateLimit-Remaining/Reset headers of every response set the
+    pace: the remaining budget, minus `reserve` requests kept for
+    others, is spread evenly until the reset. A 403/429 pauses every
+    request until Retry-After, the reset time, or an exponential
+    backoff for secondary limits that give neither.
+    """
+
+    def __init__(self, concurrency: int = 10, reserve: int = 50,
+                 backoff: float = 60.0) -> None:
+        """Init method of RateLimiter"""
+        self.concurrency = concurrency
+        self.reserve = reserve
+        self.backoff = backoff
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._strikes = 0
+
+    def interval(self, now: float) -> float:
+        """Seconds to leave between two request starts"""
+        if self.remaining is None or self.reset is None:
+            return 0.0
+        window = max(self.reset - now, 0.0)
+        usable = self.remaining - self.reserve
+        return window / usable if usable > 0 else 0.0
+
+    def delay(self) -> float:
+        """Reserve the next start slot, return how long to wait for it"""
+        now = time.time()
+        start = max(now, self._next_slot, self._paused_until)
+        self._next_slot = start + self.interval(start)
+        return start - now
+
+    def update(self, status: int, headers: Mapping[str, str],
+               payload: Any = None) -> bool:
+        """Record a response; True if it was rate limited and the
+        request should be retried after the pause.
+        """
+        if "X-RateLimit-Remaining" in headers:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            self.reset = float(headers["X-RateLimit-Reset"])
+        if self.remaining is not None and self.reset is not None \
+                and self.remaining <= self.reserve:
+            # Only the reserve is left: nobody starts before the reset
+            self._paused_until = max(self._paused_until, self.reset)
+        if status not in (403, 429):
+            self._strikes = 0
+            return False
+        if status == 403 and self.remaining != 0 \
+                and "Retry-After" not in headers \
+                and not is_rate_limit_message(payload):
+            return False  # a real permission error
+        now = time.time()
+        if "Retry-After" in headers:
+            until = now + float(headers["Retry-After"])
+        elif self.remaining == 0 and self.reset is not None:
+            until = self.reset
+        else:
+            until = now + self.backoff * 2 ** self._strikes
+        self._strikes += 1
+        self._paused_until = max(self._paused_until, until)
+        return True
+
+    async def __aenter__(self) -> "RateLimiter":
+        """Wait for a concurrency slot and a start slot"""
+        await self._semaphore.acquire()
+        wait = self.delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Free the concurrency slot"""
+        self._semaphore.release()
+
+
+class AsyncGithubOrgClient:
+    """An asyncio version of GithubOrgClient
+    """
+    ORG_URL = GithubOrgClient.ORG_URL
+    has_license = staticmethod(GithubOrgClient.has_license)
+
+    def __init__(self, org_name: str,
+                 limiter: Optional[RateLimiter] = None,
+                 max_retries: int = 3) -> None:
+        """Init method of AsyncGithubOrgClient"""
+        self._org_name = org_name
+        self._limiter = limiter or RateLimiter()
+        self._max_retries = max_retries
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    async def _get(self, url: str) -> Tuple[Any, Dict[str, str]]:
+        """Payload and {rel: url} links of url, paced and retried"""
+        for _ in range(self._max_retries + 1):
+            async with self._limiter:
+                status, headers, payload = await asyncio.to_thread(
+                    request, url)
+            if not self._limiter.update(status, headers, payload):
+                links = {link["rel"]: link["url"] for link in
+                         parse_header_links(headers.get("Link", ""))
+                         if "rel" in link}
+                return payload, links
+        raise RateLimitExceeded(url)
+
+    async def _once(self, name: str, coro_fn) -> Any:
+        """Run coro_fn once per client; later callers share the result.
+        Like memoize, failures are not kept: a task that ends cancelled
+        or with an exception is dropped so the next call retries, and a
+        cancelled caller does not cancel the shared task.
+        """
+        task = self._tasks.get(name)
+        if task is None:
+            task = self._tasks[name] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(
+                lambda done: self._forget_failed(name, done))
+        return await asyncio.shield(task)
+
+    def _forget_failed(self, name: str, task: asyncio.Future) -> None:
+        """Drop task from the shared tasks unless it succeeded"""
+        if (task.cancelled() or task.exception() is not None) \
+                and self._tasks.get(name) is task:
+            del self._tasks[name]
+
+    async def org(self) -> Dict:
+        """Memoized org"""
+        async def fetch():
+            url = self.ORG_URL.format(org=self._org_name)
+            return (await self._get(url))[0]
+        return await self._once("org", fetch)
+
+    async def repos_payload(self) -> List[Dict]:
+        """Memoized repos payload, every page, in page order"""
+        async def fetch():
+            org = await self.org()
+            first, links = await self._get(org["repos_url"])
+            rest = await asyncio.gather(
+                *(self._get(url) for url in page_urls(links)))
+            repos = list(first)
+            for payload, _ in rest:
+                repos.extend(payload)
+            while not rest and "next" in links:
+                payload, links = await self._get(links["next"])
+                repos.extend(payload)
+            return repos
+        return await self._once("repos_payload", fetch)
+
+    async def license_index(self) -> LicenseIndex:
+        """Memoized license index of the repos payload"""
+        async def build():
+            return LicenseIndex([Repo(repo, self)
+                                 for repo in await self.repos_payload()])
+        return await self._once("license_index", build)
+
+    async def public_repos(
+        self, license: Union[str, Iterable[str]] = None
+    ) -> List[str]:
+        """Public repos, same result as GithubOrgClient.public_repos"""
+        index = await self.license_index()
+        if license is None:
+            return list(index.names)
+        return index.select(license)
+
+
+async def fetch_public_repos(
+    org_names: Iterable[str], license: Union[str, Iterable[str]] = None,
+    limiter: Optional[RateLimiter] = None
+) -> Dict[str, List[str]]:
+    """public_repos for many orgs, concurrently, sharing one limiter"""
+    limiter = limiter or RateLimiter()
+    org_names = list(org_names)
+    results = await asyncio.gather(*(
+        AsyncGithubOrgClient(name, limiter).public_repos(license)
+        for name in org_names))
+    return dict(zip(org_names, results))
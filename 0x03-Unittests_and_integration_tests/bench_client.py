@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark GithubOrgClient.public_repos over HTTP against the local
+stub server: one org at a time (sync), many orgs on a thread pool
+sharing the pooled session (pooled), and AsyncGithubOrgClient (async).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from async_client import AsyncGithubOrgClient, RateLimiter
+from client import GithubOrgClient
+from stub_server import StubGitHub, synthetic_repos
+
+
+def timed(fetch: Callable[[str], List[str]], org: str) -> float:
+    """Seconds one fetch takes"""
+    start = time.perf_counter()
+    fetch(org)
+    return time.perf_counter() - start
+
+
+def run_sync(fetch: Callable, orgs: List[str], workers: int) -> List[float]:
+    """Orgs one after another"""
+    return [timed(fetch, org) for org in orgs]
+
+
+def run_pooled(fetch: Callable, orgs: List[str],
+               workers: int) -> List[float]:
+    """Orgs on `workers` threads"""
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(lambda org: timed(fetch, org), orgs))
+
+
+def run_async(org_url: str, orgs: List[str], workers: int) -> List[float]:
+    """Orgs as coroutines, at most `workers` requests at once"""
+    async def one(org: str, limiter: RateLimiter) -> float:
+        client = AsyncGithubOrgClient(org, limiter)
+        client.ORG_URL = org_url
+        start = time.perf_counter()
+        await client.public_repos()
+        return time.perf_counter() - start
+
+    async def run() -> List[float]:
+        limiter = RateLimiter(concurrency=workers, reserve=0)
+        return await asyncio.gather(*(one(org, limiter) for org in orgs))
+    return asyncio.run(run())
+
+
+def report(mode: str, latencies: List[float], elapsed: float) -> None:
+    """Print throughput and latency percentiles"""
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print("{:7s} {:9.1f} orgs/s  p50 {:7.1f} ms  p99 {:7.1f} ms".format(
+        mode, len(latencies) / elapsed,
+        statistics.median(latencies) * 1000, p99 * 1000))
+
+
+def main() -> None:
+    """Start a stub and run every mode against it"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--repos", type=int, default=90)
+    parser.add_argument("--per-page", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="seconds the stub waits per request")
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--modes", nargs="+",
+                        default=["sync", "pooled", "async"])
+    args = parser.parse_args()
+
+    # Unlimited for practical purposes, so pacing does not dominate
+    stub = StubGitHub(synthetic_repos(args.repos), per_page=args.per_page,
+                      latency=args.latency, rate_limit=10 ** 9)
+    orgs = ["org{}".format(i) for i in range(args.orgs)]
+
+    def fetch(org: str) -> List[str]:
+        client = GithubOrgClient(org)
+        client.ORG_URL = stub.org_url
+        return client.public_repos()
+
+    print("{} orgs, {} repos each, {} per page, {:.1f} ms latency".format(
+        args.orgs, args.repos, args.per_page, args.latency * 1000))
+    with stub:
+        for mode in args.modes:
+            start = time.perf_counter()
+            if mode == "async":
+                latencies = run_async(stub.org_url, orgs, args.workers)
+            elif mode == "pooled":
+                latencies = run_pooled(fetch, orgs, args.workers)
+            else:
+                latencies = run_sync(fetch, orgs, args.workers)
+            report(mode, latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Benchmark get_json's pooled session against bare requests.get
+using a local stub server.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import requests
+
+from stub_server import StubGitHub
+from utils import get_json
+
+
+def measure(label: str, fetch: Callable, url: str,
+            calls: int, threads: int) -> None:
+    """Run `calls` fetches on `threads` threads and print calls/second"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: fetch(url), range(calls)))
+    elapsed = time.perf_counter() - start
+    print("{:16s} threads={:<3d} {:8.0f} calls/s".format(
+        label, threads, calls / elapsed))
+
+
+def bare_get_json(url: str):
+    """What get_json used to do: a new connection for every call"""
+    return requests.get(url).json()
+
+
+def main() -> None:
+    """Start the stub server and run both clients against it"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    with StubGitHub(rate_limit=10 ** 9) as stub:
+        url = stub.url + "/orgs/google/repos"
+        for threads in args.threads:
+            measure("requests.get", bare_get_json, url, args.calls, threads)
+            measure("get_json", get_json, url, args.calls, threads)
+
+
+if __name__ == "__main__":
+    main()
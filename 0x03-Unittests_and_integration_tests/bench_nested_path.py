@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark access_nested_map against a precompiled NestedPath and
+extract_paths over the fixtures' repos scaled up to many records.
+"""
+import argparse
+import time
+from typing import Callable
+
+from fixtures import TEST_PAYLOAD
+from utils import NestedPath, access_nested_map, extract_paths
+
+REPOS = TEST_PAYLOAD[0][1]
+PATHS = [("name",), ("license", "key"), ("owner", "login")]
+
+
+def measure(label: str, run: Callable, records: int) -> None:
+    """Time one full pass and print records/second"""
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print("{:24s} {:8.2f} s {:12.0f} records/s".format(
+        label, elapsed, records / elapsed))
+
+
+def per_call(repos) -> list:
+    """What callers do today: one access_nested_map per path per repo"""
+    rows = []
+    for repo in repos:
+        row = []
+        for path in PATHS:
+            try:
+                row.append(access_nested_map(repo, path))
+            except KeyError:
+                row.append(None)
+        rows.append(tuple(row))
+    return rows
+
+
+def compiled(repos) -> list:
+    """Same loop with the paths compiled once"""
+    getters = [NestedPath(path).get for path in PATHS]
+    return [tuple([get(repo) for get in getters]) for repo in repos]
+
+
+def main() -> None:
+    """Scale the fixture payload and time the three approaches"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000000)
+    args = parser.parse_args()
+
+    repos = (REPOS * (args.records // len(REPOS) + 1))[:args.records]
+    expected = per_call(repos[:1000])
+    assert compiled(repos[:1000]) == expected
+    assert extract_paths(repos[:1000], PATHS) == expected
+
+    measure("access_nested_map", lambda: per_call(repos), len(repos))
+    measure("NestedPath.get", lambda: compiled(repos), len(repos))
+    measure("extract_paths", lambda: extract_paths(repos, PATHS),
+            len(repos))
+
+
+if __name__ == "__main__":
+    main()
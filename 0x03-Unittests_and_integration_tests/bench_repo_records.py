@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare the memory held by a repos listing kept as JSON dicts
+with the same listing kept as Repo records.
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from client import Repo
+from fixtures import TEST_PAYLOAD
+
+TEMPLATE = TEST_PAYLOAD[0][1]
+
+
+def load_repos(count: int) -> list:
+    """`count` repos as json.loads would return them: no string is
+    shared between two repos
+    """
+    repos = []
+    for i in range(count):
+        text = json.dumps(TEMPLATE[i % len(TEMPLATE)])
+        repo = json.loads(text)
+        repo["name"] = "{}-{}".format(repo["name"], i)
+        repos.append(repo)
+    return repos
+
+
+def held(build) -> int:
+    """Bytes still allocated once build() returns, its result alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def as_records(count: int) -> list:
+    """Records built page by page, dropping each page of dicts"""
+    records = []
+    for start in range(0, count, 100):
+        page = load_repos(min(100, count - start))
+        records.extend(Repo(repo, None) for repo in page)
+    return records
+
+
+def main() -> None:
+    """Print the memory held both ways"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repos", type=int, default=50000)
+    args = parser.parse_args()
+
+    dicts = held(lambda: load_repos(args.repos))
+    records = held(lambda: as_records(args.repos))
+    print("dicts   {:9.1f} MiB  {:7.0f} B/repo".format(
+        dicts / 2**20, dicts / args.repos))
+    print("records {:9.1f} MiB  {:7.0f} B/repo".format(
+        records / 2**20, records / args.repos))
+    print("ratio   {:9.1f}x".format(dicts / records))
+
+
+if __name__ == "__main__":
+    main()
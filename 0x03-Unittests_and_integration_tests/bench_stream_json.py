@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark peak memory of parsing a large repos listing whole
+against streaming it with a projection of fields.
+"""
+import argparse
+import copy
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from client import PUBLIC_REPOS_FIELDS
+from fixtures import TEST_PAYLOAD
+from json_stream import load_projected
+from utils import STREAM_CHUNK_SIZE
+
+TEMPLATE = TEST_PAYLOAD[0][1]
+
+
+def write_payload(path: str, repos: int) -> None:
+    """Write a synthetic listing of `repos` repos built from the
+    fixtures, one at a time so the writer itself stays small
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(repos):
+            repo = copy.deepcopy(TEMPLATE[i % len(TEMPLATE)])
+            repo["id"] = i
+            repo["name"] = "{}-{}".format(repo["name"], i)
+            f.write(("," if i else "") + json.dumps(repo))
+        f.write("]")
+
+
+def chunks(path: str):
+    """The file read the way get_json reads a streamed response"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def whole(path: str) -> list:
+    """What get_json did: read the body, parse it all"""
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+
+def measure(label: str, parse: Callable, path: str) -> None:
+    """Print time and peak traced memory of one parse"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:20s} {:7.2f} s  peak {:8.1f} MiB  ({} repos)".format(
+        label, elapsed, peak / 2**20, len(result)))
+
+
+def main() -> None:
+    """Write the payload to a temporary file and parse it both ways"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repos", type=int, default=100000)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_payload(path, args.repos)
+        print("payload {:.1f} MiB".format(os.path.getsize(path) / 2**20))
+        measure("json.loads", whole, path)
+        measure("load_projected", lambda p: load_projected(
+            chunks(p), PUBLIC_REPOS_FIELDS), path)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
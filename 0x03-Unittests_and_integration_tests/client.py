@@ -1,16 +1,109 @@
 #!/usr/bin/env python3
 """A github org client
 """
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from sys import intern
 from typing import (
-    List,
+    Any,
+    Callable,
     Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
 )
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 from utils import (
+    NestedPath,
     get_json,
-    access_nested_map,
+    get_json_page,
     memoize,
 )
+from warm_cache import Snapshot, WarmStartCache, payload_digest
+
+# Upper bound on concurrent requests for the remaining pages of a listing
+MAX_PAGE_WORKERS = 8
+
+LICENSE_KEY = NestedPath(("license", "key"))
+# Repo fields kept in Repo records, for GithubOrgClient(repo_fields=...)
+PUBLIC_REPOS_FIELDS = ("name", "license.key", "language", "fork",
+                       "private", "archived")
+
+
+def page_urls(links: Dict[str, str]) -> List[str]:
+    """URLs of pages 2..last, built from the first page's Link header"""
+    last = links.get("last")
+    if last is None:
+        return []
+    parts = urlsplit(last)
+    query = parse_qs(parts.query)
+    urls = []
+    for page in range(2, int(query["page"][0]) + 1):
+        query["page"] = [str(page)]
+        urls.append(urlunsplit(
+            parts._replace(query=urlencode(query, doseq=True))))
+    return urls
+
+
+class Repo:
+    """The fields of a repo the client uses, without the dozens of URL
+    strings of the JSON. License keys and languages are interned, so
+    every repo under the same license shares one string.
+    """
+    __slots__ = ("name", "license_key", "language", "fork", "private",
+                 "archived", "_client")
+
+    def __init__(self, repo: Dict, client: "GithubOrgClient") -> None:
+        """Init method of Repo"""
+        self.name = repo["name"]
+        key = LICENSE_KEY.get(repo)
+        self.license_key = intern(key) if type(key) is str else key
+        language = repo.get("language")
+        self.language = \
+            intern(language) if type(language) is str else language
+        self.fork = repo.get("fork", False)
+        self.private = repo.get("private", False)
+        self.archived = repo.get("archived", False)
+        self._client = client
+
+    @property
+    def raw(self) -> Dict:
+        """The repo's full JSON, fetched on first use"""
+        return self._client.raw_repo(self.name)
+
+    def __repr__(self) -> str:
+        """Repo('name', license_key='mit')"""
+        return "Repo({!r}, license_key={!r})".format(
+            self.name, self.license_key)
+
+
+class LicenseIndex:
+    """Repo names of one repos listing, grouped by license key
+    """
+    __slots__ = ("names", "positions")
+
+    def __init__(self, repos: List[Repo]) -> None:
+        """Init method of LicenseIndex"""
+        self.names = [repo.name for repo in repos]
+        self.positions: Dict[str, List[int]] = {}
+        for i, repo in enumerate(repos):
+            key = repo.license_key
+            if key is not None:
+                self.positions.setdefault(key, []).append(i)
+
+    def select(self, licenses: Union[str, Iterable[str]]) -> List[str]:
+        """Names of the repos under any of licenses, in payload order"""
+        if isinstance(licenses, str):
+            return [self.names[i] for i in self.positions.get(licenses, ())]
+        hits = set().union(*(self.positions.get(key, ())
+                             for key in licenses))
+        return [self.names[i] for i in sorted(hits)]
 
 
 class GithubOrgClient:
@@ -18,41 +111,153 @@ class GithubOrgClient:
     """
     ORG_URL = "https://api.github.com/orgs/{org}"
 
-    def __init__(self, org_name: str) -> None:
-        """Init method of GithubOrgClient"""
+    def __init__(self, org_name: str,
+                 repo_fields: Optional[Sequence[str]] = None,
+                 warm_cache: Optional[WarmStartCache] = None) -> None:
+        """Init method of GithubOrgClient.
+        With repo_fields, e.g. PUBLIC_REPOS_FIELDS, repo listings for
+        repos are parsed as a stream and only those fields are kept.
+        With warm_cache, a stored snapshot of org and repos_payload is
+        served at once and revalidated in the background; fresh
+        payloads are saved to it.
+        """
         self._org_name = org_name
+        self._repo_fields = repo_fields
+        self._warm_cache = warm_cache
+        self.revalidation: Optional[threading.Thread] = None
+        snapshot = warm_cache.load(org_name) if warm_cache else None
+        if snapshot is not None:
+            GithubOrgClient.org.prime(self, snapshot.org)
+            GithubOrgClient.repos_payload.prime(
+                self, snapshot.repos_payload)
+            self.revalidation = threading.Thread(
+                target=self._revalidate, args=(snapshot,), daemon=True)
+            self.revalidation.start()
 
     @memoize
     def org(self) -> Dict:
         """Memoize org"""
         return get_json(self.ORG_URL.format(org=self._org_name))
 
+    def refresh(self) -> None:
+        """Drop the memoized payloads so the next access refetches"""
+        GithubOrgClient.org.invalidate(self)
+        GithubOrgClient.repos_payload.invalidate(self)
+        self._invalidate_repos()
+
+    def _invalidate_repos(self) -> None:
+        """Drop everything derived from repos_payload"""
+        GithubOrgClient.repos.invalidate(self)
+        GithubOrgClient._raw_repos.invalidate(self)
+        GithubOrgClient.license_index.invalidate(self)
+
     @property
     def _public_repos_url(self) -> str:
         """Public repos URL"""
         return self.org["repos_url"]
 
+    @staticmethod
+    def _fetch(fetch: Callable, url: str,
+               fields: Optional[Sequence[str]]) -> Any:
+        """fetch(url), projected on fields when they are set"""
+        if fields is None:
+            return fetch(url)
+        return fetch(url, fields=fields)
+
+    def _repos_pages(
+        self, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[List[Dict]]:
+        """Pages of repos in page order. The first page tells how
+        many there are; the rest are fetched concurrently.
+        """
+        payload, links = self._fetch(
+            get_json_page, self._public_repos_url, fields)
+        yield payload
+        urls = page_urls(links)
+        if urls:
+            workers = min(MAX_PAGE_WORKERS, len(urls))
+            with ThreadPoolExecutor(workers) as pool:
+                yield from pool.map(
+                    partial(self._fetch, get_json, fields=fields), urls)
+            return
+        # No rel="last": all we can do is follow rel="next" one by one
+        while "next" in links:
+            payload, links = self._fetch(get_json_page, links["next"],
+                                         fields)
+            yield payload
+
+    @memoize
+    def repos_payload(self) -> List[Dict]:
+        """Memoize repos payload, every page, as the full JSON"""
+        payload = list(chain.from_iterable(self._repos_pages()))
+        if self._warm_cache is not None:
+            self._warm_cache.save(self._org_name, self.org, payload)
+        return payload
+
+    def _revalidate(self, snapshot: Snapshot) -> None:
+        """Refetch what the snapshot holds; swap in whatever changed"""
+        try:
+            org = GithubOrgClient.org.fn(self)
+            if org != snapshot.org:
+                GithubOrgClient.org.prime(self, org)
+            payload = list(chain.from_iterable(self._repos_pages()))
+        except Exception:
+            return  # keep serving the snapshot, the next start retries
+        if payload_digest(org, payload) == snapshot.validator:
+            self._warm_cache.touch(self._org_name)
+            return
+        GithubOrgClient.repos_payload.prime(self, payload)
+        self._invalidate_repos()
+        self._warm_cache.save(self._org_name, org, payload)
+
+    @memoize
+    def repos(self) -> List[Repo]:
+        """Memoize repos as Repo records. Pages are converted as they
+        arrive, so the full JSON of the listing is never kept, unless
+        a warm cache keeps it anyway.
+        """
+        if self._warm_cache is not None:
+            pages = [self.repos_payload]
+        else:
+            pages = self._repos_pages(self._repo_fields)
+        return [Repo(repo, self) for page in pages for repo in page]
+
     @memoize
-    def repos_payload(self) -> Dict:
-        """Memoize repos payload"""
-        return get_json(self._public_repos_url)
+    def _raw_repos(self) -> Dict[str, Dict]:
+        """Memoize the full JSON of repos by name"""
+        return {repo["name"]: repo for repo in self.repos_payload}
 
-    def public_repos(self, license: str = None) -> List[str]:
-        """Public repos"""
-        json_payload = self.repos_payload
-        public_repos = [
-            repo["name"] for repo in json_payload
-            if license is None or self.has_license(repo, license)
-        ]
+    def raw_repo(self, name: str) -> Dict:
+        """Full JSON of one repo; fetches the whole listing once"""
+        return self._raw_repos[name]
 
-        return public_repos
+    @memoize
+    def license_index(self) -> LicenseIndex:
+        """Memoize the license index of repos"""
+        return LicenseIndex(self.repos)
+
+    def public_repos(
+        self, license: Union[str, Iterable[str]] = None
+    ) -> List[str]:
+        """Public repos, under any of the given licenses if any"""
+        if license is None:
+            return list(self.license_index.names)
+        return self.license_index.select(license)
+
+    def iter_public_repos(
+        self, license: Union[str, Iterable[str]] = None
+    ) -> Iterator[str]:
+        """Public repos, yielded page by page as the pages arrive"""
+        wanted = {license} if isinstance(license, str) else license
+        if wanted is not None:
+            wanted = set(wanted)
+        for page in self._repos_pages(self._repo_fields):
+            for repo in page:
+                if wanted is None or LICENSE_KEY.get(repo) in wanted:
+                    yield repo["name"]
 
     @staticmethod
     def has_license(repo: Dict[str, Dict], license_key: str) -> bool:
         """Static: has_license"""
         assert license_key is not None, "license_key cannot be None"
-        try:
-            has_license = access_nested_map(repo, ("license", "key")) == license_key
-        except KeyError:
-            return False
-        return has_license
\ No newline at end of file
+        return LICENSE_KEY.get(repo) == license_key
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Conditional-request HTTP cache used by utils.get_json.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+    Optional,
+)
+
+__all__ = [
+    "CacheEntry",
+    "HTTPCache",
+]
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+# Response headers worth keeping next to the payload
+KEPT_HEADERS = ("ETag", "Last-Modified", "Cache-Control", "Link")
+
+
+class CacheEntry:
+    """A cached JSON payload with its validators and freshness
+    """
+    __slots__ = ("payload", "headers", "expires")
+
+    def __init__(self, payload: Any, headers: Mapping[str, str],
+                 expires: float) -> None:
+        """Init method of CacheEntry"""
+        self.payload = payload
+        self.headers = dict(headers)
+        self.expires = expires
+
+    @classmethod
+    def from_response(cls, payload: Any,
+                      headers: Mapping[str, str]) -> "CacheEntry":
+        """Build an entry, honoring Cache-Control max-age"""
+        kept = {k: headers[k] for k in KEPT_HEADERS if k in headers}
+        return cls(payload, kept, time.time() + max_age(kept))
+
+    def is_fresh(self) -> bool:
+        """True while max-age says the entry can be used as is"""
+        return time.time() < self.expires
+
+    def validators(self) -> Dict[str, str]:
+        """Headers that turn the next request into a conditional one"""
+        validators = {}
+        if "ETag" in self.headers:
+            validators["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def revalidated(self, headers: Mapping[str, str]) -> "CacheEntry":
+        """The entry after a 304: same payload, refreshed headers"""
+        merged = dict(self.headers)
+        merged.update(
+            {k: headers[k] for k in KEPT_HEADERS if k in headers})
+        return CacheEntry(self.payload, merged,
+                          time.time() + max_age(merged))
+
+
+def max_age(headers: Mapping[str, str]) -> int:
+    """Seconds a response may be reused without revalidation"""
+    cache_control = headers.get("Cache-Control", "")
+    if "no-cache" in cache_control.lower():
+        return 0
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else 0
+
+
+def is_storable(headers: Mapping[str, str]) -> bool:
+    """Responses without validators or marked no-store are skipped"""
+    if "no-store" in headers.get("Cache-Control", "").lower():
+        return False
+    return ("ETag" in headers or "Last-Modified" in headers
+            or max_age(headers) > 0)
+
+
+class HTTPCache:
+    """Two level cache: hot entries in memory, the rest on disk.
+    Example
+    -------
+    >>> cache = HTTPCache("~/.cache/github-client", max_bytes=50 * 2**20)
+    >>> utils.set_http_cache(cache)
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_bytes: int = 50 * 2**20,
+                 memory_entries: int = 256) -> None:
+        """Init method of HTTPCache"""
+        self.directory = (os.path.expanduser(directory)
+                          if directory else None)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Size of every file on disk, least recently used first: puts
+        # evict from here rather than listing the directory each time
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._scan()
+
+    def _scan(self) -> None:
+        """Index the files already on disk, by last use (mtime)"""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        for _, size, path in sorted(files):
+            self._disk[path] = size
+            self._disk_bytes += size
+
+    def _path(self, url: str) -> str:
+        """File holding the entry for url"""
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Entry for url from memory, else from disk"""
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+        if not self.directory:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+            os.utime(path)  # keep the use order for the next process
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if path in self._disk:
+                self._disk.move_to_end(path)
+        entry = CacheEntry(stored["payload"], stored["headers"],
+                           stored["expires"])
+        self._remember(url, entry)
+        return entry
+
+    def put(self, url: str, entry: CacheEntry) -> None:
+        """Store entry in memory and on disk"""
+        self._remember(url, entry)
+        if not self.directory:
+            return
+        path = self._path(url)
+        tmp = "{}.{}.tmp".format(path, threading.get_ident())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "payload": entry.payload,
+                       "headers": entry.headers,
+                       "expires": entry.expires}, f)
+            size = f.tell()
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(path, 0)
+            self._disk[path] = size
+        self._evict()
+
+    def _remember(self, url: str, entry: CacheEntry) -> None:
+        """Keep entry among the in-memory hot entries"""
+        with self._lock:
+            self._memory[url] = entry
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under max_bytes"""
+        with self._lock:
+            doomed = []
+            while self._disk_bytes > self.max_bytes and self._disk:
+                path, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                doomed.append(path)
+        for path in doomed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._disk_bytes = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
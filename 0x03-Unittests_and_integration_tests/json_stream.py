@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Incremental JSON parsing that keeps only a projection of fields.
+Used by utils.get_json(url, fields=...) so that a large repos listing
+never has to sit in memory in full.
+"""
+import codecs
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    Union,
+)
+
+__all__ = [
+    "iter_json_array",
+    "load_projected",
+    "projection",
+]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _Reader:
+    """A text buffer over an iterable of byte (or str) chunks that only
+    holds the part not parsed yet
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]) -> None:
+        """Init method of _Reader"""
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+
+    def more(self, at_least: int = 0) -> bool:
+        """Append at least one chunk, and at least `at_least` characters
+        when there is that much left. False at the end of the input.
+        """
+        parts = []
+        added = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._text.decode(chunk)
+            parts.append(chunk)
+            added += len(chunk)
+            if added and added >= at_least:
+                break
+        if not parts:
+            return False
+        self.buf = self.buf[self.pos:] + "".join(parts)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> None:
+        """Move past whitespace, reading more input as needed"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.more():
+                return
+
+    def peek(self) -> str:
+        """Next non-whitespace character"""
+        self.skip_whitespace()
+        if self.pos == len(self.buf):
+            raise ValueError("unexpected end of JSON input")
+        return self.buf[self.pos]
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Grow by what is pending so big values parse in
+                # linear time rather than being retried chunk by chunk
+                if not self.more(len(self.buf) - self.pos):
+                    raise
+                continue
+            # A number at the very end of the buffer may go on
+            if end == len(self.buf) and self.more():
+                continue
+            self.pos = end
+            return value
+
+    def rest(self) -> str:
+        """Everything left in the input"""
+        while self.more():
+            pass
+        return self.buf[self.pos:]
+
+
+def iter_json_array(
+    chunks: Iterable[Union[bytes, str]]
+) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one by one.
+    Example
+    -------
+    >>> list(iter_json_array([b'[{"a": 1}, {"a"', b': 2}]']))
+    [{'a': 1}, {'a': 2}]
+    """
+    reader = _Reader(chunks)
+    if reader.peek() != "[":
+        raise ValueError("expected a JSON array")
+    return _items(reader)
+
+
+def _items(reader: _Reader) -> Iterator[Any]:
+    """Items of the array whose '[' the reader is at"""
+    reader.pos += 1
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(
+                "expected ',' or ']', got {!r}".format(separator))
+
+
+def projection(fields: Sequence[str]) -> Callable[[Any], Any]:
+    """Function keeping only the dotted fields of a JSON object, nested
+    the same way. Fields missing from an object are left out.
+    Example
+    -------
+    >>> project = projection(["name", "license.key"])
+    >>> project({"name": "a", "id": 1, "license": {"key": "mit"}})
+    {'name': 'a', 'license': {'key': 'mit'}}
+    """
+    paths = [tuple(field.split(".")) for field in fields]
+
+    def project(obj: Any) -> Any:
+        """Projection of one object; anything else is kept as is"""
+        if type(obj) is not dict:
+            return obj
+        kept: dict = {}
+        for path in paths:
+            value = obj
+            for key in path:
+                if type(value) is not dict or key not in value:
+                    break
+                value = value[key]
+            else:
+                target = kept
+                for key in path[:-1]:
+                    target = target.setdefault(key, {})
+                target[path[-1]] = value
+        return kept
+
+    return project
+
+
+def load_projected(chunks: Iterable[Union[bytes, str]],
+                   fields: Sequence[str]) -> Any:
+    """Parse a JSON document keeping only `fields` of its objects.
+    A top-level array is parsed item by item, so memory holds one full
+    item plus the projections; any other document is parsed whole.
+    """
+    project = projection(fields)
+    reader = _Reader(chunks)
+    if reader.peek() != "[":
+        return project(json.loads(reader.rest()))
+    return [project(item) for item in _items(reader)]
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""A local stand-in for the GitHub orgs API, serving the fixtures'
+payloads with pagination, ETags, latency and rate-limit headers.
+Used by the benchmarks and tests to exercise the real HTTP path
+without network access.
+"""
+import argparse
+import copy
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import parse_qs, urlsplit
+
+from fixtures import TEST_PAYLOAD
+
+__all__ = [
+    "StubGitHub",
+    "synthetic_repos",
+]
+
+# (status, body, gzipped body, ETag, extra headers)
+Response = Tuple[int, bytes, bytes, str, Dict[str, str]]
+
+
+def synthetic_repos(count: int) -> List[Dict]:
+    """`count` repos cycled from the fixtures, with unique names"""
+    template = TEST_PAYLOAD[0][1]
+    repos = []
+    for i in range(count):
+        repo = copy.deepcopy(template[i % len(template)])
+        if i >= len(template):
+            repo["id"] = i
+            repo["name"] = "{}-{}".format(repo["name"], i)
+        repos.append(repo)
+    return repos
+
+
+class StubGitHub:
+    """Serves GET /orgs/<org> and GET /orgs/<org>/repos for any org
+    name, every org listing the same repos.
+    Example
+    -------
+    >>> with StubGitHub(per_page=3, latency=0.01) as stub:
+    ...     client = GithubOrgClient("google")
+    ...     client.ORG_URL = stub.org_url
+    ...     client.public_repos()
+    """
+
+    def __init__(self, repos: Optional[List[Dict]] = None,
+                 per_page: int = 30, latency: float = 0.0,
+                 rate_limit: int = 5000, rate_window: float = 3600.0,
+                 max_age: int = 0, host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        """Init method of StubGitHub"""
+        self.repos = TEST_PAYLOAD[0][1] if repos is None else repos
+        self.per_page = per_page
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.max_age = max_age
+        self.remaining = rate_limit
+        self.reset = time.time() + rate_window
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Response] = {}
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server"""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    @property
+    def org_url(self) -> str:
+        """Stand-in for GithubOrgClient.ORG_URL"""
+        return self.url + "/orgs/{org}"
+
+    def start(self) -> "StubGitHub":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubGitHub":
+        """Start the server"""
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the server"""
+        self.stop()
+
+    def take(self) -> Tuple[bool, Dict[str, str]]:
+        """Count one request against the rate limit: whether it is
+        allowed, and the X-RateLimit headers to send
+        """
+        with self._lock:
+            now = time.time()
+            if now >= self.reset:
+                self.remaining = self.rate_limit
+                self.reset = now + self.rate_window
+            allowed = self.remaining > 0
+            if allowed:
+                self.remaining -= 1
+            self.requests += 1
+            return allowed, self.rate_headers()
+
+    def rate_headers(self) -> Dict[str, str]:
+        """Current X-RateLimit headers"""
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset)),
+        }
+
+    def response(self, path: str) -> Response:
+        """The response for path, built once and reused"""
+        response = self._responses.get(path)
+        if response is None:
+            response = self._responses[path] = self._build(path)
+        return response
+
+    def _build(self, path: str) -> Response:
+        """Encode the payload for path"""
+        parts = urlsplit(path)
+        route = parts.path.strip("/").split("/")
+        headers: Dict[str, str] = {}
+        if len(route) == 2 and route[0] == "orgs":
+            payload = {"login": route[1],
+                       "repos_url": "{}/orgs/{}/repos".format(
+                           self.url, route[1])}
+        elif len(route) == 3 and route[0] == "orgs" \
+                and route[2] == "repos":
+            query = parse_qs(parts.query)
+            per_page = int(query.get("per_page", [self.per_page])[0])
+            page = int(query.get("page", [1])[0])
+            payload = self.repos[(page - 1) * per_page:page * per_page]
+            link = self._link("{}/orgs/{}/repos".format(self.url, route[1]),
+                              page, per_page)
+            if link:
+                headers["Link"] = link
+        else:
+            body = json.dumps({"message": "Not Found"}).encode()
+            return 404, body, gzip.compress(body), "", headers
+        body = json.dumps(payload).encode()
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        return 200, body, gzip.compress(body), etag, headers
+
+    def _link(self, base: str, page: int, per_page: int) -> str:
+        """Link header of one page, the way GitHub writes it"""
+        last = max(1, -(-len(self.repos) // per_page))
+        rels = []
+        if page < last:
+            rels += [("next", page + 1), ("last", last)]
+        if page > 1:
+            rels += [("prev", page - 1), ("first", 1)]
+        return ", ".join(
+            '<{}?per_page={}&page={}>; rel="{}"'.format(
+                base, per_page, number, rel) for rel, number in rels)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Request handler of StubGitHub, over keep-alive HTTP/1.1"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Answer with the payload, a 304, or a rate-limit 403"""
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        status, body, gzip_body, etag, headers = stub.response(self.path)
+        if etag and self.headers.get("If-None-Match") == etag:
+            # Like GitHub, a 304 does not count against the rate limit
+            with stub._lock:
+                stub.requests += 1
+                stub.not_modified += 1
+                rate = stub.rate_headers()
+            self.send_response(304)
+            self._send_headers(dict(rate, ETag=etag), 0)
+            return
+        allowed, rate = stub.take()
+        if not allowed:
+            body = json.dumps({"message": "API rate limit exceeded"})
+            body = body.encode()
+            self.send_response(403)
+            self._send_headers(rate, len(body))
+            self.wfile.write(body)
+            return
+        headers = dict(headers, **rate)
+        if etag:
+            headers["ETag"] = etag
+            headers["Cache-Control"] = "private, max-age={}".format(
+                stub.max_age)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip_body
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        headers["Content-Type"] = "application/json"
+        self._send_headers(headers, len(body))
+        self.wfile.write(body)
+
+    def _send_headers(self, headers: Dict[str, str], length: int) -> None:
+        """Write headers and Content-Length, then end the header block"""
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        """Keep test and benchmark output clean"""
+
+
+def main() -> None:
+    """Run the stub in the foreground, e.g. for a benchmark in
+    another process
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--repos", type=int, default=None)
+    parser.add_argument("--per-page", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    repos = synthetic_repos(args.repos) if args.repos else None
+    stub = StubGitHub(repos, per_page=args.per_page,
+                      latency=args.latency, rate_limit=args.rate_limit,
+                      port=args.port)
+    print("serving", stub.org_url)
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Test module for async_client.py"""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+from async_client import (
+    AsyncGithubOrgClient,
+    RateLimiter,
+    RateLimitExceeded,
+    fetch_public_repos,
+)
+from fixtures import TEST_PAYLOAD
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the RateLimiter pacing"""
+
+    def test_no_headers_no_pacing(self):
+        """Test that nothing is paced before the first response"""
+        limiter = RateLimiter()
+        self.assertEqual(limiter.delay(), 0)
+        self.assertEqual(limiter.delay(), 0)
+
+    def test_spreads_budget_until_reset(self):
+        """Test that the remaining budget is spread over the window"""
+        limiter = RateLimiter(reserve=0)
+        now = time.time()
+        limiter.update(200, {"X-RateLimit-Remaining": "10",
+                             "X-RateLimit-Reset": str(now + 100)})
+        self.assertAlmostEqual(limiter.interval(now), 10, places=3)
+
+    def test_reserve_exhausted_pauses_until_reset(self):
+        """Test that requests wait for the reset once only the reserve
+        is left"""
+        limiter = RateLimiter(reserve=5)
+        reset = time.time() + 30
+        limiter.update(200, {"X-RateLimit-Remaining": "5",
+                             "X-RateLimit-Reset": str(reset)})
+        self.assertAlmostEqual(limiter.delay(), 30, delta=1)
+
+    @parameterized.expand([
+        (429, {"Retry-After": "7"}, None, True, 7),
+        (403, {"X-RateLimit-Remaining": "0"}, None, True, 20),
+        (403, {"X-RateLimit-Remaining": "42"},
+         {"message": "You have exceeded a secondary rate limit."}, True, 60),
+        (403, {"X-RateLimit-Remaining": "42"},
+         {"message": "Resource not accessible by integration"}, False, 0),
+        (200, {}, None, False, 0),
+    ])
+    def test_update(self, status, headers, payload, retry, pause):
+        """Test which responses are treated as rate limited"""
+        limiter = RateLimiter(reserve=0, backoff=60)
+        limiter.reset = time.time() + 20
+        self.assertEqual(limiter.update(status, headers, payload), retry)
+        self.assertAlmostEqual(limiter.delay(), pause, delta=1)
+
+
+class TestAsyncGithubOrgClient(unittest.IsolatedAsyncioTestCase):
+    """Test AsyncGithubOrgClient against the fixtures"""
+
+    org_payload, repos_payload, expected_repos, apache2_repos = \
+        TEST_PAYLOAD[0]
+
+    def fake_request(self, url):
+        """Serve the fixtures by URL"""
+        if url.endswith("/orgs/google"):
+            return 200, {}, self.org_payload
+        if url.endswith("/repos"):
+            return 200, {}, self.repos_payload
+        return 404, {}, None
+
+    async def test_public_repos(self):
+        """Test that the result matches GithubOrgClient.public_repos"""
+        with patch("async_client.request", side_effect=self.fake_request):
+            client = AsyncGithubOrgClient("google")
+            self.assertEqual(await client.public_repos(),
+                             self.expected_repos)
+            self.assertEqual(await client.public_repos("apache-2.0"),
+                             self.apache2_repos)
+            licenses = {"apache-2.0", "bsd-3-clause"}
+            self.assertEqual(
+                await client.public_repos(licenses),
+                [repo["name"] for repo in self.repos_payload
+                 if (repo.get("license") or {}).get("key") in licenses])
+
+    async def test_fetch_public_repos(self):
+        """Test fetching several orgs at once"""
+        with patch("async_client.request",
+                   side_effect=self.fake_request) as mock_request:
+            result = await fetch_public_repos(["google", "google"])
+            self.assertEqual(result, {"google": self.expected_repos})
+            self.assertEqual(mock_request.call_count, 4)
+
+    async def test_retries_then_gives_up(self):
+        """Test that a request rate limited on every try raises"""
+        limited = (429, {"Retry-After": "0"}, None)
+        with patch("async_client.request", return_value=limited):
+            client = AsyncGithubOrgClient("google", max_retries=2)
+            with self.assertRaises(RateLimitExceeded):
+                await client.org()
+
+    async def test_timed_out_caller_does_not_poison(self):
+        """Test that a caller timing out leaves the shared fetch alive"""
+        def slow_request(url):
+            time.sleep(0.2)
+            return self.fake_request(url)
+
+        with patch("async_client.request", side_effect=slow_request):
+            client = AsyncGithubOrgClient("google")
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.public_repos(), 0.05)
+            self.assertEqual(await client.public_repos(),
+                             self.expected_repos)
+
+    async def test_failure_not_cached(self):
+        """Test that a failed fetch is retried by the next call"""
+        client = AsyncGithubOrgClient("google", max_retries=0)
+        limited = (429, {"Retry-After": "0"}, None)
+        with patch("async_client.request", return_value=limited):
+            with self.assertRaises(RateLimitExceeded):
+                await client.org()
+        with patch("async_client.request", side_effect=self.fake_request):
+            self.assertEqual(await client.org(), self.org_payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
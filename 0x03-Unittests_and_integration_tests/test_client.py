@@ -7,7 +7,7 @@ Contains unit tests for all methods of GithubOrgClient
 import unittest
 from unittest.mock import patch, PropertyMock
 from parameterized import parameterized, parameterized_class
-from client import GithubOrgClient
+from client import GithubOrgClient, PUBLIC_REPOS_FIELDS, Repo
 from fixtures import TEST_PAYLOAD
 
 
@@ -69,7 +69,7 @@ class TestGithubOrgClient(unittest.TestCase):
             # Verify the org property was accessed
             mock_org.assert_called_once()
 
-    @patch('client.get_json')
+    @patch('client.get_json_page')
     def test_public_repos(self, mock_get_json):
         """Test that public_repos returns the correct list of repositories"""
         # Mock payload for get_json (list of repos)
@@ -82,8 +82,8 @@ class TestGithubOrgClient(unittest.TestCase):
         # Mock the _public_repos_url property value
         mock_repos_url = "https://api.github.com/orgs/test-org/repos"
 
-        # Set up the mock for get_json
-        mock_get_json.return_value = mock_repos_payload
+        # Set up the mock for get_json_page: one page, no Link header
+        mock_get_json.return_value = (mock_repos_payload, {})
 
         # Create client instance
         client = GithubOrgClient("test-org")
@@ -108,9 +108,145 @@ class TestGithubOrgClient(unittest.TestCase):
             # Verify that _public_repos_url was called once
             mock_public_repos_url.assert_called_once()
 
-            # Verify that get_json was called once with correct URL
+            # Verify that get_json_page was called once with correct URL
             mock_get_json.assert_called_once_with(mock_repos_url)
 
+    @patch('client.get_json')
+    @patch('client.get_json_page')
+    def test_public_repos_paginated(self, mock_get_json_page, mock_get_json):
+        """Test that every page is fetched and kept in page order"""
+        repos_url = "https://api.github.com/orgs/test-org/repos"
+        links = {
+            "next": repos_url + "?per_page=2&page=2",
+            "last": repos_url + "?per_page=2&page=3",
+        }
+        mock_get_json_page.return_value = (
+            [{"name": "repo1"}, {"name": "repo2"}], links)
+        pages = {
+            repos_url + "?per_page=2&page=2": [{"name": "repo3"}],
+            repos_url + "?per_page=2&page=3": [{"name": "repo4"}],
+        }
+        mock_get_json.side_effect = pages.get
+
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value=repos_url):
+            client = GithubOrgClient("test-org")
+            self.assertEqual(client.public_repos(),
+                             ["repo1", "repo2", "repo3", "repo4"])
+            self.assertEqual(list(client.iter_public_repos()),
+                             ["repo1", "repo2", "repo3", "repo4"])
+
+    @patch('client.get_json_page')
+    def test_public_repos_follows_next(self, mock_get_json_page):
+        """Test that pages are followed when there is no last link"""
+        repos_url = "https://api.github.com/orgs/test-org/repos"
+        mock_get_json_page.side_effect = [
+            ([{"name": "repo1"}], {"next": repos_url + "?page=2"}),
+            ([{"name": "repo2"}], {}),
+        ]
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value=repos_url):
+            client = GithubOrgClient("test-org")
+            self.assertEqual(client.public_repos(), ["repo1", "repo2"])
+
+    @patch('client.get_json_page')
+    def test_repo_fields(self, mock_get_json_page):
+        """Test that repo_fields are passed on to the streaming parse"""
+        mock_get_json_page.return_value = (
+            [{"name": "repo1", "license": {"key": "mit"}}], {})
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value="https://example.com/repos"):
+            client = GithubOrgClient("test-org",
+                                     repo_fields=PUBLIC_REPOS_FIELDS)
+            self.assertEqual(client.public_repos("mit"), ["repo1"])
+            mock_get_json_page.assert_called_once_with(
+                "https://example.com/repos", fields=PUBLIC_REPOS_FIELDS)
+
+    @patch('client.get_json_page')
+    def test_repos_records(self, mock_get_json_page):
+        """Test that repos are slotted records with a lazy raw JSON"""
+        mock_get_json_page.side_effect = lambda url: ([
+            {"name": "repo1", "license": {"key": "mit"}, "fork": True,
+             "language": "Python", "url": "https://example.com/1"},
+            {"name": "repo2", "license": {"key": "mit"}},
+        ], {})
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value="https://example.com/repos"):
+            client = GithubOrgClient("test-org")
+            repo1, repo2 = client.repos
+            self.assertIsInstance(repo1, Repo)
+            self.assertFalse(hasattr(repo1, "__dict__"))
+            self.assertEqual((repo1.name, repo1.license_key, repo1.fork,
+                              repo1.private, repo1.language),
+                             ("repo1", "mit", True, False, "Python"))
+            self.assertIs(repo1.license_key, repo2.license_key)
+            mock_get_json_page.assert_called_once()
+
+            self.assertEqual(repo1.raw["url"], "https://example.com/1")
+            self.assertEqual(repo2.raw["name"], "repo2")
+            self.assertEqual(mock_get_json_page.call_count, 2)
+
+    @patch('client.get_json_page')
+    def test_refresh(self, mock_get_json_page):
+        """Test that refresh refetches the memoized payloads"""
+        mock_get_json_page.return_value = ([{"name": "repo1"}], {})
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value="https://example.com/repos"):
+            client = GithubOrgClient("test-org")
+            self.assertEqual(client.public_repos(), ["repo1"])
+            mock_get_json_page.return_value = ([{"name": "repo2"}], {})
+            self.assertEqual(client.public_repos(), ["repo1"])
+            client.refresh()
+            self.assertEqual(client.public_repos(), ["repo2"])
+
+    @parameterized.expand([
+        ("mit", ["repo1", "repo4"]),
+        (["apache-2.0", "mit"], ["repo1", "repo2", "repo4"]),
+        ({"gpl-3.0"}, []),
+        ((), []),
+    ])
+    @patch('client.get_json_page')
+    def test_public_repos_by_license(self, license, expected,
+                                     mock_get_json_page):
+        """Test license filters, single or several, keep payload order"""
+        mock_get_json_page.return_value = ([
+            {"name": "repo1", "license": {"key": "mit"}},
+            {"name": "repo2", "license": {"key": "apache-2.0"}},
+            {"name": "repo3", "license": None},
+            {"name": "repo4", "license": {"key": "mit"}},
+        ], {})
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value="https://example.com/repos"):
+            client = GithubOrgClient("test-org")
+            self.assertEqual(client.public_repos(license), expected)
+            self.assertEqual(list(client.iter_public_repos(license)),
+                             expected)
+
+    @patch('client.get_json_page')
+    def test_license_index_built_once(self, mock_get_json_page):
+        """Test that the index is reused until refresh"""
+        mock_get_json_page.return_value = (
+            [{"name": "repo1", "license": {"key": "mit"}}], {})
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=PropertyMock,
+                          return_value="https://example.com/repos"):
+            client = GithubOrgClient("test-org")
+            index = client.license_index
+            client.public_repos("mit")
+            client.public_repos(["mit", "bsd"])
+            self.assertIs(client.license_index, index)
+            mock_get_json_page.return_value = (
+                [{"name": "repo2", "license": {"key": "mit"}}], {})
+            client.refresh()
+            self.assertIsNot(client.license_index, index)
+            self.assertEqual(client.public_repos("mit"), ["repo2"])
+
     @parameterized.expand([
         ({"license": {"key": "my_license"}}, "my_license", True),
         ({"license": {"key": "other_license"}}, "my_license", False),
@@ -140,16 +276,18 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        """Set up class method to mock requests.get"""
-        # Start a patcher for requests.get
-        cls.get_patcher = patch('requests.get')
+        """Set up class method to mock the shared session's get"""
+        # Start a patcher for requests.Session.get
+        cls.get_patcher = patch('requests.Session.get')
 
         # Start the mock
         cls.mock_get = cls.get_patcher.start()
 
         # Define side_effect function to return different payloads based on URL
-        def side_effect(url):
+        def side_effect(url, **kwargs):
             class MockResponse:
+                headers = {}
+
                 @staticmethod
                 def json():
                     if url.endswith('/orgs/test-org'):
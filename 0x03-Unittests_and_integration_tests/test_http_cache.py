@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Test module for http_cache.py"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, Mock
+from parameterized import parameterized
+from requests.structures import CaseInsensitiveDict
+from http_cache import CacheEntry, HTTPCache, max_age, is_storable
+import utils
+
+
+def mock_response(status, payload=None, headers=None):
+    """Build a fake requests.Response"""
+    response = Mock()
+    response.status_code = status
+    response.ok = status < 400
+    response.json.return_value = payload
+    response.headers = CaseInsensitiveDict(headers or {})
+    return response
+
+
+class TestCacheHeaders(unittest.TestCase):
+    """Test the header helpers"""
+
+    @parameterized.expand([
+        ({"Cache-Control": "public, max-age=60, s-maxage=60"}, 60),
+        ({"Cache-Control": "private, max-age=0"}, 0),
+        ({"Cache-Control": "no-cache, max-age=60"}, 0),
+        ({}, 0),
+    ])
+    def test_max_age(self, headers, expected):
+        """Test that max_age reads Cache-Control"""
+        self.assertEqual(max_age(headers), expected)
+
+    @parameterized.expand([
+        ({"ETag": '"abc"'}, True),
+        ({"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, True),
+        ({"ETag": '"abc"', "Cache-Control": "no-store"}, False),
+        ({}, False),
+    ])
+    def test_is_storable(self, headers, expected):
+        """Test that only validated or fresh responses are stored"""
+        self.assertEqual(is_storable(headers), expected)
+
+    def test_validators(self):
+        """Test that an entry produces conditional request headers"""
+        entry = CacheEntry.from_response([], {
+            "ETag": '"abc"', "Last-Modified": "yesterday"})
+        self.assertEqual(entry.validators(), {
+            "If-None-Match": '"abc"', "If-Modified-Since": "yesterday"})
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Test the memory and disk levels of HTTPCache"""
+
+    def setUp(self):
+        """Give every test its own cache directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_disk_round_trip(self):
+        """Test that a new cache instance reads entries from disk"""
+        entry = CacheEntry({"a": 1}, {"ETag": '"x"'}, time.time() + 60)
+        HTTPCache(self.tmp.name).put("http://a", entry)
+
+        loaded = HTTPCache(self.tmp.name).get("http://a")
+        self.assertEqual(loaded.payload, {"a": 1})
+        self.assertEqual(loaded.headers, {"ETag": '"x"'})
+        self.assertTrue(loaded.is_fresh())
+
+    def test_memory_bound(self):
+        """Test that only memory_entries entries stay in memory"""
+        cache = HTTPCache(memory_entries=2)
+        for url in ("http://a", "http://b", "http://c"):
+            cache.put(url, CacheEntry(url, {}, 0))
+        self.assertIsNone(cache.get("http://a"))
+        self.assertEqual(cache.get("http://c").payload, "http://c")
+
+    def test_disk_bound(self):
+        """Test that the oldest files are evicted past max_bytes"""
+        cache = HTTPCache(self.tmp.name, max_bytes=500, memory_entries=0)
+        for i in range(3):
+            cache.put("http://{}".format(i), CacheEntry("x" * 100, {}, 0))
+        cache.get("http://0")  # now more recently used than 1
+        with patch("os.listdir") as mock_listdir:
+            for i in range(3, 5):
+                cache.put("http://{}".format(i),
+                          CacheEntry("x" * 100, {}, 0))
+            mock_listdir.assert_not_called()
+        self.assertIsNone(cache.get("http://1"))
+        self.assertIsNotNone(cache.get("http://0"))
+        self.assertIsNotNone(cache.get("http://4"))
+
+    def test_disk_bound_across_instances(self):
+        """Test that files left by another instance are evicted oldest
+        first"""
+        cache = HTTPCache(self.tmp.name, memory_entries=0)
+        for i in range(5):
+            cache.put("http://{}".format(i), CacheEntry("x" * 100, {}, 0))
+            past = time.time() - 100 + i
+            os.utime(cache._path("http://{}".format(i)), (past, past))
+        cache = HTTPCache(self.tmp.name, max_bytes=500, memory_entries=0)
+        cache.put("http://5", CacheEntry("x" * 100, {}, 0))
+        self.assertIsNone(cache.get("http://0"))
+        self.assertIsNotNone(cache.get("http://4"))
+        self.assertIsNotNone(cache.get("http://5"))
+
+
+class TestGetJsonCached(unittest.TestCase):
+    """Test get_json with an HTTP cache set"""
+
+    def setUp(self):
+        """Install an in-memory cache for the test"""
+        utils.set_http_cache(HTTPCache())
+        self.addCleanup(utils.set_http_cache, None)
+
+    def test_fresh_entry_skips_request(self):
+        """Test that max-age responses are reused without a request"""
+        first = mock_response(200, {"v": 1}, {"Cache-Control": "max-age=60"})
+        with patch("requests.Session.get", return_value=first) as mock_get:
+            self.assertEqual(utils.get_json("http://a"), {"v": 1})
+            self.assertEqual(utils.get_json("http://a"), {"v": 1})
+            mock_get.assert_called_once()
+
+    def test_revalidates_with_etag(self):
+        """Test that stale entries are revalidated and 304 reuses them"""
+        first = mock_response(200, {"v": 1}, {"ETag": '"abc"'})
+        not_modified = mock_response(304, None, {"ETag": '"abc"'})
+        with patch("requests.Session.get",
+                   side_effect=[first, not_modified]) as mock_get:
+            self.assertEqual(utils.get_json("http://a"), {"v": 1})
+            self.assertEqual(utils.get_json("http://a"), {"v": 1})
+            mock_get.assert_called_with(
+                "http://a", headers={"If-None-Match": '"abc"'},
+                timeout=utils.DEFAULT_TIMEOUT)
+
+    def test_changed_resource_replaces_entry(self):
+        """Test that a 200 on revalidation replaces the payload"""
+        first = mock_response(200, {"v": 1}, {"ETag": '"abc"'})
+        changed = mock_response(200, {"v": 2}, {"ETag": '"def"'})
+        with patch("requests.Session.get", side_effect=[first, changed]):
+            utils.get_json("http://a")
+            self.assertEqual(utils.get_json("http://a"), {"v": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
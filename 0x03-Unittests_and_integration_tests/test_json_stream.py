@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test module for json_stream.py"""
+
+import json
+import unittest
+from unittest.mock import patch, Mock
+from parameterized import parameterized
+from fixtures import TEST_PAYLOAD
+from json_stream import iter_json_array, load_projected, projection
+import utils
+
+REPOS = TEST_PAYLOAD[0][1]
+BODY = json.dumps(REPOS, indent=2, ensure_ascii=False).encode()
+
+
+def chunked(body, size):
+    """Split body into chunks of size bytes"""
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """Test the incremental array parser"""
+
+    @parameterized.expand([(1,), (7,), (4096,), (len(BODY),)])
+    def test_chunk_sizes(self, size):
+        """Test that any chunking parses to the same items"""
+        self.assertEqual(list(iter_json_array(chunked(BODY, size))), REPOS)
+
+    @parameterized.expand([
+        ([b"[1", b"23, 4", b"5]"], [123, 45]),
+        ([b'["\xc3', b'\xa9"]'], ["é"]),
+        ([" [ ] "], []),
+    ])
+    def test_boundaries(self, chunks, expected):
+        """Test numbers and characters split across chunks"""
+        self.assertEqual(list(iter_json_array(chunks)), expected)
+
+    @parameterized.expand([
+        ([b"{}"],),
+        ([b"[1 2]"],),
+        ([b"[1,"],),
+        ([b"[1"],),
+        ([b""],),
+    ])
+    def test_invalid(self, chunks):
+        """Test ValueError on anything but a complete array"""
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunks))
+
+
+class TestProjection(unittest.TestCase):
+    """Test projections of parsed objects"""
+
+    def test_projection(self):
+        """Test nested fields are kept and missing ones left out"""
+        project = projection(["name", "license.key", "owner.id"])
+        repo = {"name": "a", "license": None, "owner": {"id": 1, "x": 2}}
+        self.assertEqual(project(repo), {"name": "a", "owner": {"id": 1}})
+
+    def test_load_projected(self):
+        """Test a streamed array keeps only the projection"""
+        projected = load_projected(chunked(BODY, 100),
+                                   ["name", "license.key"])
+        self.assertEqual(projected[0], {
+            "name": "episodes.dart", "license": {"key": "bsd-3-clause"}})
+        self.assertEqual([repo["name"] for repo in projected],
+                         [repo["name"] for repo in REPOS])
+
+    def test_load_projected_object(self):
+        """Test that a top-level object is projected too"""
+        self.assertEqual(
+            load_projected([b'{"repos_url": "u",', b' "id": 1}'],
+                           ["repos_url"]),
+            {"repos_url": "u"})
+
+
+class TestGetJsonFields(unittest.TestCase):
+    """Test get_json's streaming mode"""
+
+    def test_get_json_fields(self):
+        """Test that the body is streamed and the response closed"""
+        response = Mock()
+        response.iter_content.return_value = iter(chunked(BODY, 512))
+        with patch("requests.Session.get",
+                   return_value=response) as mock_get:
+            payload = utils.get_json("http://a", fields=["name"])
+            mock_get.assert_called_once_with(
+                "http://a", timeout=utils.DEFAULT_TIMEOUT, stream=True)
+        self.assertEqual(payload, [{"name": repo["name"]}
+                                   for repo in REPOS])
+        response.iter_content.assert_called_once_with(
+            utils.STREAM_CHUNK_SIZE)
+        response.close.assert_called_once()
+        response.json.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
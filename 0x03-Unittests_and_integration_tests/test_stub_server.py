@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test module for stub_server.py: the clients over real HTTP"""
+
+import asyncio
+import unittest
+from parameterized import parameterized
+from async_client import AsyncGithubOrgClient, RateLimiter
+from client import GithubOrgClient
+from fixtures import TEST_PAYLOAD
+from http_cache import HTTPCache
+from stub_server import StubGitHub, synthetic_repos
+import utils
+
+EXPECTED_REPOS, APACHE2_REPOS = TEST_PAYLOAD[0][2], TEST_PAYLOAD[0][3]
+
+
+class TestStubGitHub(unittest.TestCase):
+    """Test GithubOrgClient against the stub server"""
+
+    def serve(self, **kwargs):
+        """Start a stub for the test"""
+        stub = StubGitHub(**kwargs).start()
+        self.addCleanup(stub.stop)
+        return stub
+
+    def client(self, stub, cls=GithubOrgClient, **kwargs):
+        """A client pointed at stub"""
+        client = cls("google", **kwargs)
+        client.ORG_URL = stub.org_url
+        return client
+
+    @parameterized.expand([(30,), (4,), (1,)])
+    def test_public_repos(self, per_page):
+        """Test that every page is fetched, in order"""
+        stub = self.serve(per_page=per_page)
+        client = self.client(stub)
+        self.assertEqual(client.public_repos(), EXPECTED_REPOS)
+        self.assertEqual(client.public_repos("apache-2.0"), APACHE2_REPOS)
+        self.assertEqual(stub.requests, 1 + -(-len(EXPECTED_REPOS)
+                                              // per_page))
+
+    def test_async_client(self):
+        """Test that the async client gets the same result"""
+        stub = self.serve(per_page=4)
+        client = self.client(stub, AsyncGithubOrgClient,
+                             limiter=RateLimiter(reserve=0))
+        self.assertEqual(asyncio.run(client.public_repos()),
+                         EXPECTED_REPOS)
+
+    def test_etag_revalidation(self):
+        """Test that a cached listing is revalidated with a 304"""
+        stub = self.serve()
+        utils.set_http_cache(HTTPCache())
+        self.addCleanup(utils.set_http_cache, None)
+        self.client(stub).public_repos()
+        self.assertEqual(self.client(stub).public_repos(), EXPECTED_REPOS)
+        self.assertEqual(stub.not_modified, 2)
+        self.assertEqual(stub.remaining, stub.rate_limit - 2)
+
+    def test_rate_limit(self):
+        """Test the rate-limit headers and the 403 past the limit"""
+        stub = self.serve(rate_limit=1)
+        session = utils.get_session()
+        first = session.get(stub.org_url.format(org="google"))
+        self.assertEqual(first.headers["X-RateLimit-Remaining"], "0")
+        second = session.get(stub.org_url.format(org="google"))
+        self.assertEqual(second.status_code, 403)
+
+    def test_synthetic_repos(self):
+        """Test that synthetic repos have unique names"""
+        repos = synthetic_repos(25)
+        self.assertEqual(len({repo["name"] for repo in repos}), 25)
+        self.assertEqual(repos[:9], TEST_PAYLOAD[0][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 """Test module for utils.py"""
 
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 from parameterized import parameterized
-from utils import access_nested_map, get_json, memoize
+from utils import (
+    NestedPath,
+    access_nested_map,
+    extract_paths,
+    get_json,
+    get_session,
+    memoize,
+)
+import utils
 from client import GithubOrgClient
 
 
@@ -31,6 +41,55 @@ class TestAccessNestedMap(unittest.TestCase):
             access_nested_map(nested_map, path)
 
 
+class TestNestedPath(unittest.TestCase):
+    """Test the compiled accessor and bulk extraction"""
+
+    @parameterized.expand([
+        ({"a": 1}, ("a",), 1),
+        ({"a": {"b": 2}}, ("a",), {"b": 2}),
+        ({"a": {"b": 2}}, ("a", "b"), 2),
+    ])
+    def test_call(self, nested_map, path, expected):
+        """Test that the accessor agrees with access_nested_map"""
+        self.assertEqual(NestedPath(path)(nested_map), expected)
+
+    @parameterized.expand([
+        ({}, ("a",)),
+        ({"a": 1}, ("a", "b")),
+        ({"a": "xy"}, ("a", "b")),
+    ])
+    def test_call_exception(self, nested_map, path):
+        """Test KeyError is raised for invalid paths"""
+        with self.assertRaises(KeyError):
+            NestedPath(path)(nested_map)
+
+    @parameterized.expand([
+        ({"a": {"b": 2}}, 2),
+        ({"a": {}}, "missing"),
+        ({"a": None}, "missing"),
+        ({}, "missing"),
+    ])
+    def test_get(self, nested_map, expected):
+        """Test that missing keys give the default"""
+        self.assertEqual(NestedPath(("a", "b")).get(nested_map, "missing"),
+                         expected)
+
+    def test_extract_paths(self):
+        """Test several paths over several payloads in one pass"""
+        payloads = [
+            {"name": "a", "license": {"key": "mit"}},
+            {"name": "b", "license": None},
+            {"name": "c"},
+        ]
+        self.assertEqual(
+            extract_paths(payloads, [("name",), NestedPath(
+                ("license", "key"))]),
+            [("a", "mit"), ("b", None), ("c", None)])
+        self.assertEqual(
+            NestedPath(("license", "key")).extract(payloads, "none"),
+            ["mit", "none", "none"])
+
+
 class TestGetJson(unittest.TestCase):
     """Test get_json function"""
 
@@ -44,13 +103,30 @@ class TestGetJson(unittest.TestCase):
         mock_response.json.return_value = test_payload
 
         with patch(
-            "requests.get", return_value=mock_response
+            "requests.Session.get", return_value=mock_response
         ) as mock_get:
             result = get_json(test_url)
-            mock_get.assert_called_once_with(test_url)
+            mock_get.assert_called_once_with(
+                test_url, timeout=utils.DEFAULT_TIMEOUT
+            )
             self.assertEqual(result, test_payload)
 
 
+class TestGetSession(unittest.TestCase):
+    """Test the shared HTTP session"""
+
+    def test_get_session_is_shared(self):
+        """Test that every call returns the same session"""
+        self.assertIs(get_session(), get_session())
+
+    def test_get_session_pool(self):
+        """Test that the session pools connections per host"""
+        adapter = get_session().get_adapter("https://api.github.com")
+        self.assertEqual(adapter._pool_maxsize, utils.POOL_MAXSIZE)
+        self.assertTrue(adapter._pool_block)
+        self.assertIn("gzip", get_session().headers["Accept-Encoding"])
+
+
 class TestMemoize(unittest.TestCase):
     """Test class for the memoize decorator"""
 
@@ -83,5 +159,164 @@ class TestMemoize(unittest.TestCase):
             self.assertEqual(result2, 42)
             mock_method.assert_called_once()
 
+    def test_memoize_invalidate(self):
+        """Test that invalidate forces the next access to recompute"""
+        calls = []
+
+        class TestClass:
+            @memoize
+            def a_property(self):
+                calls.append(1)
+                return len(calls)
+
+        obj = TestClass()
+        self.assertEqual(obj.a_property, 1)
+        TestClass.a_property.invalidate(obj)
+        self.assertEqual(obj.a_property, 2)
+        self.assertEqual(obj.a_property, 2)
+
+    def test_memoize_prime(self):
+        """Test that a primed value is served without computing"""
+        calls = []
+
+        class TestClass:
+            @memoize
+            def a_property(self):
+                calls.append(1)
+                return 42
+
+            @memoize
+            def square(self, x):
+                calls.append(x)
+                return x * x
+
+        obj = TestClass()
+        TestClass.a_property.prime(obj, 7)
+        obj.square.prime(10, 3)
+        self.assertEqual(obj.a_property, 7)
+        self.assertEqual(obj.square(3), 10)
+        self.assertEqual(calls, [])
+
+    def test_memoize_invalidate_in_flight(self):
+        """Test that a computation invalidated while running is not kept"""
+        started, release = threading.Event(), threading.Event()
+        values = iter(["stale", "fresh"])
+
+        class TestClass:
+            @memoize
+            def a_property(self):
+                value = next(values)
+                if value == "stale":
+                    started.set()
+                    release.wait()
+                return value
+
+        obj = TestClass()
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(obj.a_property))
+        thread.start()
+        started.wait()
+        TestClass.a_property.invalidate(obj)
+        release.set()
+        thread.join()
+        self.assertEqual(results, ["stale"])
+        self.assertEqual(obj.a_property, "fresh")
+        self.assertEqual(obj.a_property, "fresh")
+
+    def test_memoize_ttl(self):
+        """Test that values expire after ttl seconds"""
+        class TestClass:
+            @memoize(ttl=10)
+            def a_property(self):
+                return time.monotonic()
+
+        obj = TestClass()
+        with patch("utils.monotonic", return_value=100.0):
+            first = obj.a_property
+        with patch("utils.monotonic", return_value=105.0):
+            self.assertEqual(obj.a_property, first)
+        with patch("utils.monotonic", return_value=111.0):
+            self.assertNotEqual(obj.a_property, first)
+
+    def test_memoize_arguments(self):
+        """Test that methods with arguments keep a bounded LRU"""
+        calls = []
+
+        class TestClass:
+            @memoize(maxsize=2)
+            def square(self, x, power=2):
+                calls.append(x)
+                return x ** power
+
+        obj = TestClass()
+        self.assertEqual(obj.square(3), 9)
+        self.assertEqual(obj.square(3), 9)
+        self.assertEqual(obj.square(3, power=3), 27)
+        self.assertEqual(obj.square(4), 16)
+        self.assertEqual(calls, [3, 3, 4])
+        # square(3) was the least recently used entry and got evicted
+        obj.square(3)
+        self.assertEqual(calls, [3, 3, 4, 3])
+        obj.square.invalidate(4)
+        obj.square(4)
+        self.assertEqual(calls, [3, 3, 4, 3, 4])
+
+    def test_memoize_single_flight(self):
+        """Test that racing threads run the method only once"""
+        calls = []
+        barrier = threading.Barrier(8)
+
+        class TestClass:
+            @memoize
+            def a_property(self):
+                calls.append(1)
+                time.sleep(0.05)
+                return 42
+
+        obj = TestClass()
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append(obj.a_property)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(len(calls), 1)
+
+    @parameterized.expand([
+        (("_a_property",),),
+        (("__weakref__",),),
+    ])
+    def test_memoize_slots(self, slots):
+        """Test that __slots__ classes can be memoized"""
+        class TestClass:
+            __slots__ = slots
+
+            @memoize
+            def a_property(self):
+                return 42
+
+        obj = TestClass()
+        self.assertEqual(obj.a_property, 42)
+        self.assertEqual(obj.a_property, 42)
+
+    def test_memoize_slots_without_storage(self):
+        """Test the error for __slots__ classes with nowhere to cache"""
+        class TestClass:
+            __slots__ = ()
+
+            @memoize
+            def a_property(self):
+                return 42
+
+        with self.assertRaises(TypeError):
+            TestClass().a_property
+
 if __name__ == "__main__":
     unittest.main()
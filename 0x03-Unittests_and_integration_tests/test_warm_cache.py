@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test module for warm_cache.py"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from client import GithubOrgClient
+from fixtures import TEST_PAYLOAD
+from warm_cache import WarmStartCache
+
+ORG, REPOS = TEST_PAYLOAD[0][0], TEST_PAYLOAD[0][1]
+
+
+class TestWarmStartCache(unittest.TestCase):
+    """Test the snapshot store"""
+
+    def setUp(self):
+        """Give every test its own directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = WarmStartCache(self.tmp.name, max_age=60)
+
+    def test_round_trip(self):
+        """Test that a saved snapshot loads with the same validator"""
+        saved = self.cache.save("google", ORG, REPOS)
+        loaded = self.cache.load("google")
+        self.assertEqual(loaded.org, ORG)
+        self.assertEqual(loaded.repos_payload, REPOS)
+        self.assertEqual(loaded.validator, saved.validator)
+        self.assertIsNone(self.cache.load("abc"))
+
+    def test_max_age(self):
+        """Test that old snapshots are ignored until touched"""
+        self.cache.save("google", ORG, REPOS)
+        path = self.cache._path("google")
+        past = time.time() - 120
+        os.utime(path, (past, past))
+        self.assertIsNone(self.cache.load("google"))
+        self.cache.touch("google")
+        self.assertIsNotNone(self.cache.load("google"))
+
+    def test_corrupt_file(self):
+        """Test that an unreadable snapshot counts as missing"""
+        with open(self.cache._path("google"), "w") as f:
+            f.write("{")
+        self.assertIsNone(self.cache.load("google"))
+
+
+class TestWarmStart(unittest.TestCase):
+    """Test GithubOrgClient with a warm cache"""
+
+    def setUp(self):
+        """Seed a cache with the fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = WarmStartCache(self.tmp.name)
+
+    def test_cold_start_saves(self):
+        """Test that fetched payloads are stored for the next start"""
+        with patch("client.get_json", return_value=ORG), \
+                patch("client.get_json_page", return_value=(REPOS, {})):
+            client = GithubOrgClient("google", warm_cache=self.cache)
+            self.assertIsNone(client.revalidation)
+            self.assertEqual(client.public_repos(), TEST_PAYLOAD[0][2])
+        self.assertEqual(self.cache.load("google").repos_payload, REPOS)
+
+    def test_warm_start_unchanged(self):
+        """Test that the snapshot is served and revalidated"""
+        self.cache.save("google", ORG, REPOS)
+        with patch("client.get_json", return_value=ORG) as mock_get_json, \
+                patch("client.get_json_page", return_value=(REPOS, {})):
+            client = GithubOrgClient("google", warm_cache=self.cache)
+            self.assertEqual(client.public_repos("apache-2.0"),
+                             TEST_PAYLOAD[0][3])
+            client.revalidation.join()
+            mock_get_json.assert_called_once()
+        self.assertEqual(client.repos_payload, REPOS)
+
+    def test_warm_start_changed(self):
+        """Test that a changed listing replaces the snapshot"""
+        self.cache.save("google", ORG, REPOS)
+        fresh = [{"name": "new", "license": {"key": "mit"}}]
+        with patch("client.get_json", return_value=ORG), \
+                patch("client.get_json_page", return_value=(fresh, {})):
+            client = GithubOrgClient("google", warm_cache=self.cache)
+            client.revalidation.join()
+            self.assertEqual(client.public_repos("mit"), ["new"])
+        self.assertEqual(self.cache.load("google").repos_payload, fresh)
+
+    def test_revalidation_failure_keeps_snapshot(self):
+        """Test that a failed revalidation keeps serving the snapshot"""
+        self.cache.save("google", ORG, REPOS)
+        with patch("client.get_json", side_effect=OSError):
+            client = GithubOrgClient("google", warm_cache=self.cache)
+            client.revalidation.join()
+            self.assertEqual(client.public_repos(), TEST_PAYLOAD[0][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,22 +1,56 @@
 #!/usr/bin/env python3
 """Generic utilities for github org client.
 """
+import threading
 import requests
-from functools import wraps
+from collections import OrderedDict
+from functools import partial, update_wrapper, wraps
+from inspect import signature
+from math import inf
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
+from time import monotonic
 from typing import (
     Mapping,
     Sequence,
     Any,
     Dict,
     Callable,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
 )
+from weakref import WeakKeyDictionary
+
+from http_cache import CacheEntry, HTTPCache, is_storable
+from json_stream import load_projected
 
 __all__ = [
+    "NestedPath",
     "access_nested_map",
+    "extract_paths",
+    "fetch_json",
     "get_json",
+    "get_json_page",
+    "get_session",
     "memoize",
+    "set_http_cache",
 ]
 
+# (connect, read) timeouts in seconds for every request
+DEFAULT_TIMEOUT = (3.05, 10)
+# Hosts to keep a connection pool for, and connections kept per host
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+# Bytes read at a time when a response is parsed as a stream
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_http_cache: Optional[HTTPCache] = None
+
 
 def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     """Access nested map with key path.
@@ -40,15 +74,388 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     return nested_map
 
 
-def get_json(url: str) -> Dict:
+_MISSING = object()
+
+
+class NestedPath:
+    """A key path compiled once and reused for many lookups.
+    Same result as access_nested_map, but the path is already a tuple
+    and plain dicts skip the Mapping ABC check.
+    Example
+    -------
+    >>> license_key = NestedPath(("license", "key"))
+    >>> license_key({"license": {"key": "mit"}})
+    'mit'
+    >>> license_key.get({"license": None}, "none")
+    'none'
+    """
+    __slots__ = ("path",)
+
+    def __init__(self, path: Sequence) -> None:
+        """Init method of NestedPath"""
+        self.path = tuple(path)
+
+    def __call__(self, nested_map: Mapping) -> Any:
+        """Value at the path; KeyError when it is missing"""
+        for key in self.path:
+            if type(nested_map) is not dict \
+                    and not isinstance(nested_map, Mapping):
+                raise KeyError(key)
+            nested_map = nested_map[key]
+        return nested_map
+
+    def get(self, nested_map: Mapping, default: Any = None) -> Any:
+        """Value at the path, or default when it is missing"""
+        for key in self.path:
+            if type(nested_map) is dict:
+                nested_map = nested_map.get(key, _MISSING)
+            elif isinstance(nested_map, Mapping):
+                try:
+                    nested_map = nested_map[key]
+                except KeyError:
+                    return default
+            else:
+                return default
+            if nested_map is _MISSING:
+                return default
+        return nested_map
+
+    def extract(self, payloads: Iterable[Mapping],
+                default: Any = None) -> List[Any]:
+        """Value at the path for every payload"""
+        get = self.get
+        return [get(payload, default) for payload in payloads]
+
+    def __repr__(self) -> str:
+        """NestedPath(('a', 'b'))"""
+        return "NestedPath({!r})".format(self.path)
+
+
+def extract_paths(payloads: Iterable[Mapping], paths: Sequence[Sequence],
+                  default: Any = None) -> List[Tuple]:
+    """Extract several paths from every payload in a single pass.
+    Example
+    -------
+    >>> extract_paths(repos, [("name",), ("license", "key")])
+    [('episodes.dart', 'bsd-3-clause'), ('cpp-netlib', 'bsl-1.0'), ...]
+    """
+    getters = [path.get if isinstance(path, NestedPath)
+               else NestedPath(path).get for path in paths]
+    return [tuple([get(payload, default) for get in getters])
+            for payload in payloads]
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use.
+    Connections are kept alive and reused across calls and threads;
+    at most POOL_MAXSIZE connections are opened per host, callers
+    beyond that wait for a free one.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    pool_block=True,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                _session = session
+    return _session
+
+
+def set_http_cache(cache: Optional[HTTPCache]) -> None:
+    """Route get_json through an HTTPCache, or stop caching with None.
+    """
+    global _http_cache
+    _http_cache = cache
+
+
+def _read_json(response: requests.Response,
+               fields: Optional[Sequence[str]]) -> Any:
+    """Body of response as JSON, projected on fields if given"""
+    if fields is None:
+        return response.json()
+    try:
+        return load_projected(
+            response.iter_content(STREAM_CHUNK_SIZE), fields)
+    finally:
+        response.close()
+
+
+def fetch_json(
+    url: str, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    fields: Optional[Sequence[str]] = None
+) -> Tuple[Any, Mapping[str, str]]:
+    """Get JSON and the response headers from remote URL.
+    With fields, e.g. ("name", "license.key"), the body is streamed
+    and parsed incrementally, keeping only those fields of each object.
+    With an HTTP cache set, fresh entries are returned without a
+    request and stale ones are revalidated with If-None-Match /
+    If-Modified-Since; a 304 reuses the cached payload.
+    """
+    options: Dict[str, Any] = {"timeout": timeout}
+    if fields is not None:
+        options["stream"] = True
+    cache = _http_cache
+    if cache is None:
+        response = get_session().get(url, **options)
+        return _read_json(response, fields), response.headers
+
+    # Projections are cached apart from the full payload, but they
+    # share its validators: a 304 holds for both
+    key = url if fields is None else "{}#{}".format(url, ",".join(fields))
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh():
+        return entry.payload, entry.headers
+    validators = entry.validators() if entry is not None else {}
+    response = get_session().get(url, headers=validators, **options)
+    if response.status_code == 304 and entry is not None:
+        response.close()
+        entry = entry.revalidated(response.headers)
+        cache.put(key, entry)
+        return entry.payload, entry.headers
+    payload = _read_json(response, fields)
+    if response.ok and is_storable(response.headers):
+        cache.put(key, CacheEntry.from_response(payload, response.headers))
+    return payload, response.headers
+
+
+def get_json(
+    url: str, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    fields: Optional[Sequence[str]] = None
+) -> Dict:
     """Get JSON from remote URL.
     """
-    response = requests.get(url)
-    return response.json()
+    return fetch_json(url, timeout, fields)[0]
+
+
+def get_json_page(
+    url: str, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    fields: Optional[Sequence[str]] = None
+) -> Tuple[Any, Dict[str, str]]:
+    """Get one page of a paginated JSON resource.
+    Returns the payload and the Link header as {rel: url}.
+    Example
+    -------
+    >>> payload, links = get_json_page(repos_url)
+    >>> links.get("next")
+    'https://api.github.com/organizations/1342004/repos?page=2'
+    """
+    payload, headers = fetch_json(url, timeout, fields)
+    links = {}
+    for link in parse_header_links(headers.get("Link", "")):
+        if "rel" in link:
+            links[link["rel"]] = link["url"]
+    return payload, links
+
+
+class _Flight:
+    """A computation other threads can wait on instead of repeating it"""
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        """Init method of _Flight"""
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        """Result of the computation, or its exception re-raised"""
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _MemoCell:
+    """Per-instance memo storage: an LRU of (value, expiry) and the
+    computations currently in flight
+    """
+    __slots__ = ("lock", "entries", "flights", "generation")
+
+    def __init__(self) -> None:
+        """Init method of _MemoCell"""
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = \
+            OrderedDict()
+        self.flights: Dict[Hashable, _Flight] = {}
+        # Bumped by invalidate/prime: computations started before that
+        # must not store their (stale) result
+        self.generation = 0
+
+
+class _Memoized:
+    """Descriptor shared by memoized properties and methods.
+    The per-instance cell lives in the instance attribute
+    `_<name>` (a __dict__ entry or a declared slot) or, for
+    __slots__ classes without that slot, in a weak dictionary.
+    """
+
+    def __init__(self, fn: Callable, ttl: Optional[float],
+                 maxsize: int) -> None:
+        """Init method of _Memoized"""
+        self.fn = fn
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.attr_name = "_{}".format(fn.__name__)
+        self._cells: "WeakKeyDictionary[Any, _MemoCell]" = \
+            WeakKeyDictionary()
+        self._lock = threading.Lock()
+        update_wrapper(self, fn)
+
+    def _cell(self, instance: Any, create: bool = True) -> _MemoCell:
+        """The memo cell of instance, created on first use"""
+        cell = getattr(instance, self.attr_name, None)
+        if isinstance(cell, _MemoCell):
+            return cell
+        with self._lock:
+            cell = getattr(instance, self.attr_name, None)
+            if isinstance(cell, _MemoCell):
+                return cell
+            try:
+                return self._cells[instance]
+            except (KeyError, TypeError):
+                pass
+            if not create:
+                return None
+            cell = _MemoCell()
+            try:
+                setattr(instance, self.attr_name, cell)
+            except AttributeError:
+                try:
+                    self._cells[instance] = cell
+                except TypeError:
+                    raise TypeError(
+                        "memoize needs a '{}' or '__weakref__' slot on {}"
+                        .format(self.attr_name, type(instance).__name__))
+            return cell
+
+    def call(self, instance: Any, key: Hashable,
+             args: tuple, kwargs: dict) -> Any:
+        """Cached result for key, computing it at most once at a time"""
+        cell = self._cell(instance)
+        with cell.lock:
+            hit = cell.entries.get(key)
+            if hit is not None and hit[1] > monotonic():
+                cell.entries.move_to_end(key)
+                return hit[0]
+            flight = cell.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = cell.flights[key] = _Flight()
+                generation = cell.generation
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = self.fn(instance, *args, **kwargs)
+        except BaseException as error:
+            with cell.lock:
+                self._land(cell, key, flight)
+            flight.error = error
+            flight.event.set()
+            raise
+        with cell.lock:
+            if cell.generation == generation:
+                self._store(cell, key, value)
+            self._land(cell, key, flight)
+        flight.value = value
+        flight.event.set()
+        return value
+
+    @staticmethod
+    def _land(cell: _MemoCell, key: Hashable, flight: _Flight) -> None:
+        """Forget flight unless invalidate already replaced it"""
+        if cell.flights.get(key) is flight:
+            del cell.flights[key]
+
+    def _store(self, cell: _MemoCell, key: Hashable, value: Any) -> None:
+        """Cache value under key; the caller holds cell.lock"""
+        expires = monotonic() + self.ttl if self.ttl is not None else inf
+        cell.entries[key] = (value, expires)
+        cell.entries.move_to_end(key)
+        while len(cell.entries) > self.maxsize:
+            cell.entries.popitem(last=False)
 
+    def prime(self, instance: Any, value: Any, *args, **kwargs) -> None:
+        """Cache value for instance (and the given arguments) as if it
+        had just been computed
+        """
+        cell = self._cell(instance)
+        key = _make_key(args, kwargs)
+        with cell.lock:
+            cell.generation += 1
+            cell.flights.pop(key, None)
+            self._store(cell, key, value)
 
-def memoize(fn: Callable) -> Callable:
+    def invalidate(self, instance: Any, *args, **kwargs) -> None:
+        """Forget the cached value(s) of instance: every entry, or only
+        the one for the given arguments. Computations already running
+        finish for their callers but their results are not kept, and
+        later callers start a new one.
+        """
+        cell = self._cell(instance, create=False)
+        if cell is None:
+            return
+        with cell.lock:
+            cell.generation += 1
+            if args or kwargs:
+                key = _make_key(args, kwargs)
+                cell.entries.pop(key, None)
+                cell.flights.pop(key, None)
+            else:
+                cell.entries.clear()
+                cell.flights.clear()
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    """Hashable key for a call's arguments"""
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+_KWARGS_MARK = object()
+
+
+class _MemoizedProperty(_Memoized):
+    """Memoized attribute for methods that only take self"""
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        """Cached value, computed on first access"""
+        if instance is None:
+            return self
+        return self.call(instance, (), (), {})
+
+
+class _MemoizedMethod(_Memoized):
+    """Memoized method taking arguments, one LRU per instance"""
+
+    def __get__(self, instance: Any, owner: type = None) -> Callable:
+        """The method bound to instance"""
+        if instance is None:
+            return self
+
+        @wraps(self.fn)
+        def bound(*args, **kwargs):
+            return self.call(instance, _make_key(args, kwargs), args, kwargs)
+        bound.invalidate = partial(self.invalidate, instance)
+        bound.prime = partial(self.prime, instance)
+        return bound
+
+
+def memoize(fn: Callable = None, *, ttl: Optional[float] = None,
+            maxsize: int = 128) -> Callable:
     """Decorator to memoize a method.
+    A method taking only self becomes a cached attribute; one taking
+    arguments stays a method with a per-instance LRU of `maxsize`
+    results. Values expire after `ttl` seconds when given. Concurrent
+    first accesses on one instance run the method only once.
     Example
     -------
     class MyClass:
@@ -62,14 +469,13 @@ def memoize(fn: Callable) -> Callable:
     42
     >>> my_object.a_method
     42
+    >>> MyClass.a_method.invalidate(my_object)
+    >>> my_object.a_method
+    a_method called
+    42
     """
-    attr_name = "_{}".format(fn.__name__)
-
-    @wraps(fn)
-    def memoized(self):
-        """"memoized wraps"""
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, fn(self))
-        return getattr(self, attr_name)
-
-    return property(memoized)
\ No newline at end of file
+    if fn is None:
+        return partial(memoize, ttl=ttl, maxsize=maxsize)
+    if len(signature(fn).parameters) == 1:
+        return _MemoizedProperty(fn, ttl, maxsize)
+    return _MemoizedMethod(fn, ttl, maxsize)
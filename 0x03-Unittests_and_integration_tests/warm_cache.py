@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Snapshots of GithubOrgClient's memoized payloads kept on disk, so a
+new process can start from them instead of a cold fetch.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+__all__ = [
+    "Snapshot",
+    "WarmStartCache",
+]
+
+
+def payload_digest(org: Dict, repos_payload: List[Dict]) -> str:
+    """Validator of a snapshot: changes whenever either payload does"""
+    text = json.dumps([org, repos_payload], sort_keys=True,
+                      separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class Snapshot:
+    """The memoized payloads of one org, their validator and the time
+    they were last known to be current (the file's mtime)
+    """
+    __slots__ = ("org", "repos_payload", "validator", "saved")
+
+    def __init__(self, org: Dict, repos_payload: List[Dict],
+                 validator: str, saved: float) -> None:
+        """Init method of Snapshot"""
+        self.org = org
+        self.repos_payload = repos_payload
+        self.validator = validator
+        self.saved = saved
+
+    def age(self) -> float:
+        """Seconds since the payloads were last known to be current"""
+        return time.time() - self.saved
+
+
+class WarmStartCache:
+    """One JSON file per org under directory. Snapshots older than
+    max_age seconds are ignored.
+    Example
+    -------
+    >>> cache = WarmStartCache("~/.cache/github-client/orgs")
+    >>> client = GithubOrgClient("google", warm_cache=cache)
+    """
+
+    def __init__(self, directory: str,
+                 max_age: float = 7 * 24 * 3600) -> None:
+        """Init method of WarmStartCache"""
+        self.directory = os.path.expanduser(directory)
+        self.max_age = max_age
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, org_name: str) -> str:
+        """File holding the snapshot of org_name"""
+        name = hashlib.sha256(org_name.encode()).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def load(self, org_name: str) -> Optional[Snapshot]:
+        """Snapshot of org_name, or None if missing, unreadable or
+        older than max_age
+        """
+        try:
+            with open(self._path(org_name), encoding="utf-8") as f:
+                saved = os.fstat(f.fileno()).st_mtime
+                stored = json.load(f)
+            snapshot = Snapshot(stored["org"], stored["repos_payload"],
+                                stored["validator"], saved)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if snapshot.age() > self.max_age:
+            return None
+        return snapshot
+
+    def save(self, org_name: str, org: Dict,
+             repos_payload: List[Dict]) -> Snapshot:
+        """Store the payloads of org_name as current"""
+        snapshot = Snapshot(org, repos_payload,
+                            payload_digest(org, repos_payload), time.time())
+        path = self._path(org_name)
+        tmp = "{}.{}.tmp".format(path, threading.get_ident())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"org_name": org_name, "org": org,
+                       "repos_payload": repos_payload,
+                       "validator": snapshot.validator}, f)
+        os.replace(tmp, path)
+        return snapshot
+
+    def touch(self, org_name: str) -> None:
+        """Mark the stored snapshot as current without rewriting it"""
+        try:
+            os.utime(self._path(org_name))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Drop every snapshot"""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
@@ -1,14 +1,20 @@
+import time
 import sqlite3
+import threading
+
+from row_factories import sqlite_row_factory
 
 # 1️⃣ Custom class-based context manager
 class DatabaseConnection:
-    def __init__(self, db_name):
+    def __init__(self, db_name, row_factory=None):
         self.db_name = db_name
+        self.row_factory = sqlite_row_factory(row_factory)  # dict, namedtuple, slots
         self.conn = None
 
     def __enter__(self):
         """Open database connection when entering the 'with' block"""
         self.conn = sqlite3.connect(self.db_name)
+        self.conn.row_factory = self.row_factory
         print(f"Connected to database: {self.db_name}")
         return self.conn
 
@@ -21,9 +27,140 @@ class DatabaseConnection:
         return False
 
 
-# 2️ Use the context manager
-with DatabaseConnection("database.db") as conn:
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users")
-    results = cursor.fetchall()
-    print("Query results:", results)
+# 2️⃣ Bounded connection pool, one per database path
+class ConnectionPool:
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_name, size=5, timeout=5.0):
+        self.db_name = db_name
+        self.size = size
+        self.timeout = timeout      # Seconds to wait for a free connection
+        self._idle = []             # Reuse the most recently used first
+        self._lock = threading.Lock()
+        # Signalled whenever a connection is returned or a slot frees up, so
+        # waiters also wake when an unhealthy connection is discarded
+        self._available = threading.Condition(self._lock)
+        self.stats = {
+            "opened": 0, "closed": 0, "checkouts": 0, "waits": 0,
+            "timeouts": 0, "health_failures": 0, "rollbacks": 0,
+        }
+
+    @classmethod
+    def for_database(cls, db_name, size=5, timeout=5.0):
+        """Return the shared pool for db_name, creating it on first use."""
+        with cls._pools_lock:
+            if db_name not in cls._pools:
+                cls._pools[db_name] = cls(db_name, size, timeout)
+            return cls._pools[db_name]
+
+    def _discard(self, conn):
+        with self._available:
+            self.stats["opened"] -= 1
+            self.stats["closed"] += 1
+            self._available.notify()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self, timeout=None):
+        """Check out a healthy connection, waiting up to timeout seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            with self._available:
+                while not self._idle and self.stats["opened"] >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise TimeoutError(
+                            f"No connection to {self.db_name} free after {timeout}s")
+                    if not waited:
+                        self.stats["waits"] += 1
+                        waited = True
+                    self._available.wait(remaining)
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self.stats["opened"] += 1  # take the slot, connect unlocked
+                    conn = None
+            if conn is None:
+                try:
+                    conn = sqlite3.connect(self.db_name, check_same_thread=False)
+                except Exception:
+                    with self._available:
+                        self.stats["opened"] -= 1
+                        self._available.notify()
+                    raise
+                self.stats["checkouts"] += 1
+                return conn
+            if self._is_healthy(conn):
+                self.stats["checkouts"] += 1
+                return conn
+            self.stats["health_failures"] += 1
+            self._discard(conn)
+
+    def release(self, conn):
+        """Return a connection, rolling back any transaction left open."""
+        conn.row_factory = None
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                self.stats["rollbacks"] += 1
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._available:
+            self._idle.append(conn)
+            self._available.notify()
+
+    def close(self):
+        with self._available:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+# 3️⃣ Context manager backed by the pool
+class PooledDatabaseConnection:
+    def __init__(self, db_name, pool_size=5, timeout=5.0, row_factory=None):
+        self.pool = ConnectionPool.for_database(db_name, pool_size, timeout)
+        self.row_factory = sqlite_row_factory(row_factory)
+        self.conn = None
+
+    def __enter__(self):
+        """Check a connection out of the pool for the 'with' block"""
+        self.conn = self.pool.acquire()
+        self.conn.row_factory = self.row_factory
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Give the connection back to the pool instead of closing it"""
+        if self.conn:
+            self.pool.release(self.conn)
+            self.conn = None
+        return False
+
+
+# 4️⃣ Use the context manager
+if __name__ == "__main__":
+    with DatabaseConnection("database.db") as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM users")
+        results = cursor.fetchall()
+        print("Query results:", results)
+
+    for _ in range(1000):
+        with PooledDatabaseConnection("database.db") as conn:
+            conn.execute("SELECT * FROM users").fetchall()
+    print("Pool stats:", ConnectionPool.for_database("database.db").stats)
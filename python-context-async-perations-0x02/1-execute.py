@@ -1,22 +1,89 @@
 import sqlite3
+from collections import OrderedDict
+
+from row_factories import column_names, fetch_columns, row_converter
 
 class ExecuteQuery:
-    def __init__(self, query, params=()):
+    def __init__(self, query, params=(), stream=False, arraysize=1000,
+                 batch_size=None, db_name="users.db", param_sets=None,
+                 cached_statements=128, row_factory=None):
         self.query = query          # SQL query string
         self.params = params        # Query parameters (tuple)
+        self.param_sets = param_sets  # Many parameter tuples for one statement
+        self.cached_statements = cached_statements  # SQLite statement cache size
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._statements = OrderedDict()  # Mirrors SQLite's LRU statement cache
+        self.stream = stream        # Yield rows lazily instead of fetchall()
+        self.arraysize = arraysize  # Rows pulled from SQLite per fetchmany()
+        self.batch_size = batch_size  # Yield lists of rows instead of rows
+        self.db_name = db_name
+        self.row_factory = row_factory  # tuple, dict, namedtuple, slots, columnar, numpy
+        if stream and not batch_size and row_factory in ("columnar", "numpy"):
+            raise ValueError("Columnar results need batch_size when streaming")
         self.conn = None            # Will hold the database connection
         self.cursor = None          # Will hold the cursor
         self.results = None         # Will hold query results
 
     def __enter__(self):
         """Opens the database connection and executes the query."""
-        self.conn = sqlite3.connect("users.db")
+        self.conn = sqlite3.connect(self.db_name,
+                                    cached_statements=self.cached_statements)
         self.cursor = self.conn.cursor()
+        self.cursor.arraysize = self.arraysize
+        if self.param_sets is not None:
+            print(f"Executing query: {self.query} | Param sets: {len(self.param_sets)}")
+            # Same SQL text on one connection: SQLite prepares it once
+            self.results = [self.execute(params) for params in self.param_sets]
+            return self.results
         print(f"Executing query: {self.query} | Params: {self.params}")
-        self.cursor.execute(self.query, self.params)
-        self.results = self.cursor.fetchall()
+        self.execute(self.params, fetch=False)
+        if self.stream or self.batch_size:
+            # The connection stays open until __exit__, rows are read on demand
+            self.results = self._batches() if self.batch_size else self._rows()
+        elif self.row_factory in ("columnar", "numpy"):
+            self.results = fetch_columns(self.cursor, self.row_factory == "numpy")
+        else:
+            self.results = self._convert(self.cursor.fetchall())
         return self.results  # Return results directly for use inside 'with'
 
+    def execute(self, params=(), fetch=True, query=None):
+        """Run the query (or another one) on the open connection."""
+        query = query or self.query
+        if query in self._statements:
+            self.cache_stats["hits"] += 1
+            self._statements.move_to_end(query)
+        else:
+            self.cache_stats["misses"] += 1
+            self._statements[query] = True
+            if len(self._statements) > self.cached_statements:
+                self._statements.popitem(last=False)
+        self.cursor.execute(query, params)
+        names = column_names(self.cursor) if self.cursor.description else ()
+        self._convert = row_converter(self.row_factory, names)
+        return self._convert(self.cursor.fetchall()) if fetch else None
+
+    @property
+    def hit_rate(self):
+        """Share of executions served by an already prepared statement."""
+        total = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return self.cache_stats["hits"] / total if total else 0.0
+
+    def _rows(self):
+        """Yield rows one at a time, fetching arraysize rows per round trip."""
+        while True:
+            rows = self.cursor.fetchmany()
+            if not rows:
+                return
+            yield from self._convert(rows)
+
+    def _batches(self):
+        """Yield lists of up to batch_size rows."""
+        while True:
+            batch = self.cursor.fetchmany(self.batch_size)
+            if not batch:
+                return
+            yield self._convert(batch)
+
     def __exit__(self, exc_type, exc_value, traceback):
         """Closes the connection safely."""
         if self.conn:
@@ -1,32 +1,568 @@
+import re
 import asyncio
+import operator
+import contextlib
+import contextvars
+from collections.abc import Mapping
 import aiosqlite
 
-# Function 1: Fetch all users
-async def async_fetch_users():
-    async with aiosqlite.connect("users.db") as db:
-        async with db.execute("SELECT * FROM users") as cursor:
-            results = await cursor.fetchall()
-            print("✅ All Users:")
-            for user in results:
-                print(user)
-            return results
+DB_NAME = "users.db"
+
+
+# Async pool: a fixed number of aiosqlite connections (one thread each)
+class AsyncConnectionPool:
+    def __init__(self, db_name=DB_NAME, size=4):
+        self.db_name = db_name
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._opened = 0
+
+    async def acquire(self):
+        """Hand out an idle connection, opening a new one while under size."""
+        if self._idle.empty() and self._opened < self.size:
+            self._opened += 1
+            try:
+                return await aiosqlite.connect(self.db_name)
+            except BaseException:  # cancelled by a deadline, too
+                self._opened -= 1
+                raise
+        return await self._idle.get()
+
+    def release(self, conn):
+        self._idle.put_nowait(conn)
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    async def fetch(self, query, params=()):
+        async with self.connection() as db:
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchall()
+
+    async def close(self):
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+            self._opened -= 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+
+# Deadlines: an absolute loop time inherited by every task started under it
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(timeout):
+    """Everything awaited inside must finish within `timeout` seconds.
+
+    Nested deadlines keep the earliest one; tasks created inside inherit it.
+    """
+    expires = asyncio.get_running_loop().time() + timeout
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left(timeout=None):
+    """Seconds until the tighter of `timeout` and the current deadline."""
+    expires = _deadline.get()
+    if expires is None:
+        return timeout
+    left = expires - asyncio.get_running_loop().time()
+    return left if timeout is None else min(left, timeout)
+
+
+async def _fetchall(db, query, params):
+    async with db.execute(query, params) as cursor:
+        return await cursor.fetchall()
+
+
+async def _within_deadline(awaitable, what):
+    """Await `awaitable`, raising TimeoutError once the deadline passes."""
+    remaining = time_left()
+    if remaining is not None and remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise asyncio.TimeoutError(f"Deadline passed before {what}")
+    return await asyncio.wait_for(awaitable, remaining)
+
+
+def _deadline_for(timeout):
+    return deadline(timeout) if timeout is not None else contextlib.nullcontext()
+
+
+async def fetch_with_deadline(query, params=(), pool=None, timeout=None):
+    """Fetch rows, giving up after `timeout` or the current deadline.
+
+    The clock starts on entry, so waiting for a pool connection counts
+    too. On timeout or cancellation the running statement is stopped
+    with interrupt(), so the connection thread does not keep working for
+    a caller that has gone.
+    """
+    with _deadline_for(timeout):
+        async with contextlib.AsyncExitStack() as stack:
+            if pool is not None:
+                db = await _within_deadline(pool.acquire(), f"a connection for: {query}")
+                stack.callback(pool.release, db)
+            else:
+                db = await stack.enter_async_context(aiosqlite.connect(DB_NAME))
+            remaining = time_left()
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError(f"Deadline passed before running: {query}")
+            task = asyncio.ensure_future(_fetchall(db, query, params))
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), remaining)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                await db.interrupt()
+                # Let the interrupted statement unwind before the connection is reused
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+
+
+# Run any number of queries through the pool, at most `limit` at a time
+async def run_queries(queries, pool, limit=8, timeout=None, return_exceptions=False):
+    """queries: SQL strings or (sql, params) pairs. Results keep their order.
+
+    A query that takes longer than `timeout` seconds (or outlives the
+    current deadline), waiting for its turn included, is interrupted and
+    raises TimeoutError (or returns it, with return_exceptions=True).
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(query):
+        sql, params = (query, ()) if isinstance(query, str) else query
+        with _deadline_for(timeout):
+            await _within_deadline(semaphore.acquire(), f"a slot for: {sql}")
+            try:
+                return await fetch_with_deadline(sql, params, pool)
+            finally:
+                semaphore.release()
+
+    return await asyncio.gather(*(run_one(q) for q in queries),
+                                return_exceptions=return_exceptions)
+
+
+async def gather_within(queries, pool, timeout, per_query_timeout=None, limit=8):
+    """Run a batch under one deadline and return whatever finished in time.
+
+    The result list lines up with `queries`; a query that missed its own
+    or the batch deadline, or failed, holds its exception instead.
+    """
+    with deadline(timeout):
+        return await run_queries(queries, pool, limit=limit,
+                                 timeout=per_query_timeout,
+                                 return_exceptions=True)
+
+
+# Shared scans: overlapping reads of one table become a single scan
+_SIMPLE_SELECT = re.compile(
+    r"^\s*SELECT\s+(?P<columns>\*|\w+(?:\s*,\s*\w+)*)\s+FROM\s+(?P<table>\w+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+_CONDITION = re.compile(
+    r"^\s*(?P<column>\w+)\s*(?P<op><=|>=|<>|!=|=|<|>)\s*"
+    r"(?P<value>\?|-?\d+(?:\.\d+)?|'(?:[^']|'')*')\s*$")
+_AND = re.compile(r"\s+AND\s+", re.IGNORECASE)
+_OPERATORS = {"=": operator.eq, "!=": operator.ne, "<>": operator.ne,
+              "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def _sort_key(value):
+    # SQLite orders storage classes NULL < INTEGER/REAL < TEXT < BLOB
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return (3, bytes(value))
+    raise TypeError(f"Unsupported parameter type: {type(value).__name__}")
+
+
+_COLLATE = re.compile(r"\bCOLLATE\s+[\"'`\[]?(\w+)", re.IGNORECASE)
+_CONSTRAINT = re.compile(r"^(CONSTRAINT|PRIMARY|UNIQUE|CHECK|FOREIGN)\b", re.IGNORECASE)
+
+
+def _column_collations(create_sql):
+    """{column: collation} parsed from a CREATE TABLE statement, or None."""
+    start, end = create_sql.find("("), create_sql.rfind(")")
+    if start < 0 or end < start:
+        return None
+    definitions, depth, current = [], 0, []
+    for char in create_sql[start + 1:end]:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            definitions.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    definitions.append("".join(current))
+    collations = {}
+    for definition in definitions:
+        definition = definition.strip()
+        if not definition or _CONSTRAINT.match(definition):
+            continue
+        name = definition.split()[0].strip("\"'`[]").lower()
+        match = _COLLATE.search(definition)
+        collations[name] = match[1].upper() if match else "BINARY"
+    return collations
+
+
+def _dedup_key(query, params):
+    """Key shared by identical queries in flight, None if params can't be hashed."""
+    if isinstance(params, Mapping):
+        key = (query, "named", tuple(sorted(params.items())))
+    else:
+        key = (query, tuple(params))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def parse_simple_select(query, params=()):
+    """(table, columns, conditions) for SELECT ... FROM t [WHERE a op b AND ...].
+
+    Returns None for anything else; those queries are sent to SQLite as is.
+    """
+    match = _SIMPLE_SELECT.match(query)
+    if not match or isinstance(params, Mapping):  # only ? placeholders
+        return None
+    columns = None if match["columns"] == "*" else [
+        c.strip() for c in match["columns"].split(",")]
+    conditions, params = [], list(params)
+    for part in _AND.split(match["where"]) if match["where"] else []:
+        condition = _CONDITION.match(part)
+        if not condition:
+            return None
+        value = condition["value"]
+        if value == "?":
+            if not params:
+                return None
+            value = params.pop(0)
+        elif value.startswith("'"):
+            value = value[1:-1].replace("''", "'")
+        else:
+            value = float(value) if "." in value else int(value)
+        conditions.append((condition["column"], _OPERATORS[condition["op"]], value))
+    if params:
+        return None
+    return match["table"], columns, conditions
+
+
+class QueryCoalescer:
+    """Merges concurrent reads issued within `window` seconds of each other.
+
+    Identical queries in flight share one execution. Simple SELECTs that
+    SQLite would answer with a full SCAN of the same table are served
+    from one shared scan, each query's WHERE clause being evaluated in
+    Python. Anything SQLite can do better or differently goes to SQLite:
+    index SEARCHes, NULL parameters, columns with a non-BINARY collation,
+    and comparisons between different storage classes (affinity).
+    """
+
+    def __init__(self, pool, window=0.002):
+        self.pool = pool
+        self.window = window
+        self._inflight = {}   # (query, params) -> future
+        self._pending = {}    # table -> [(columns, conditions, query, params, future)]
+        self._tasks = set()
+        self._collations = {}  # table -> {column: collation}, None if unknown
+        self._scans = {}       # query -> True if SQLite would scan the table
+        self.stats = {"queries": 0, "deduplicated": 0, "direct": 0,
+                      "shared_scans": 0, "served_by_scans": 0}
+
+    async def fetch(self, query, params=()):
+        self.stats["queries"] += 1
+        key = _dedup_key(query, params)
+        if key is None:
+            # Unhashable parameters can't be matched up, let SQLite judge them
+            self.stats["direct"] += 1
+            return await self.pool.fetch(query, params)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._inflight[key] = loop.create_future()
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # The work runs in its own task: a cancelled caller, the first one
+        # included, must not leave the others waiting on a dead future
+        self._spawn(self._dispatch(query, params, future))
+        return await asyncio.shield(future)
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _dispatch(self, query, params, future):
+        try:
+            parsed = parse_simple_select(query, params)
+            if parsed is not None and await self._shareable(parsed, query, params):
+                table, columns, conditions = parsed
+                if table not in self._pending:
+                    self._pending[table] = []
+                    asyncio.get_running_loop().call_later(
+                        self.window, self._spawn_flush, table)
+                self._pending[table].append((columns, conditions, query, params, future))
+                return
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.stats["direct"] += 1
+        await self._run(query, params, future)
+
+    async def _shareable(self, parsed, query, params):
+        """True if a shared scan answers the query exactly as SQLite would."""
+        table, _, conditions = parsed
+        if any(value is None for _, _, value in conditions):
+            return False
+        if table not in self._collations:
+            self._collations[table] = await self._table_collations(table)
+        collations = self._collations[table]
+        if collations is None or any(
+                collations.get(column.lower(), "BINARY") != "BINARY"
+                for column, _, _ in conditions):
+            return False
+        if query not in self._scans:
+            async with self.pool.connection() as db:
+                async with db.execute("EXPLAIN QUERY PLAN " + query, params) as cursor:
+                    details = [row[3] for row in await cursor.fetchall()]
+            self._scans[query] = bool(details) and all(
+                detail.upper().startswith("SCAN") for detail in details)
+        return self._scans[query]
+
+    async def _table_collations(self, table):
+        """{column: collation} from the table's CREATE statement."""
+        async with self.pool.connection() as db:
+            async with db.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (table,)) as cursor:
+                row = await cursor.fetchone()
+        if row is None or row[0] is None:
+            return None
+        return _column_collations(row[0])
+
+    async def _run(self, query, params, future):
+        try:
+            rows = await self.pool.fetch(query, params)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(rows)
+
+    def _spawn_flush(self, table):
+        self._spawn(self._flush(table))
+
+    async def _flush(self, table):
+        batch = self._pending.pop(table)
+        try:
+            await self._serve(table, batch)
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            # Whatever went wrong, no caller may be left waiting
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _serve(self, table, batch):
+        if len(batch) == 1:
+            # Nothing to share, let SQLite use its indexes
+            _, _, query, params, future = batch[0]
+            self.stats["direct"] += 1
+            return await self._run(query, params, future)
+
+        async with self.pool.connection() as db:
+            async with db.execute(f"SELECT * FROM {table}") as cursor:
+                names = [column[0] for column in cursor.description]
+                rows = await cursor.fetchall()
+
+        self.stats["shared_scans"] += 1
+        index = {name.lower(): i for i, name in enumerate(names)}
+        for columns, conditions, query, params, future in batch:
+            try:
+                checks = [(index[c.lower()], op, _sort_key(v)) for c, op, v in conditions]
+                picks = [index[c.lower()] for c in columns] if columns else None
+            except (KeyError, TypeError):
+                # Unknown column or unsupported value: let SQLite answer
+                result = None
+            else:
+                result = self._filter(rows, checks, picks)
+            if result is None:
+                # Also for mixed storage classes: column affinity may apply
+                self.stats["direct"] += 1
+                await self._run(query, params, future)
+            else:
+                self.stats["served_by_scans"] += 1
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def _filter(rows, checks, picks):
+        result = []
+        for row in rows:
+            for i, op, value in checks:
+                if row[i] is None:
+                    break
+                key = _sort_key(row[i])
+                if key[0] != value[0]:
+                    return None
+                if not op(key, value):
+                    break
+            else:
+                result.append(tuple(row[i] for i in picks) if picks else row)
+        return result
+
+
+# Streaming: rows are fetched only as fast as the consumer takes them
+async def stream_query(query, params=(), pool=None, chunk_size=500, chunks=False):
+    """Async generator over a query's rows (or lists of rows with chunks=True).
+
+    Wrap it in contextlib.aclosing() when leaving the loop early so the
+    connection goes back to the pool straight away.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        if pool is not None:
+            db = await stack.enter_async_context(pool.connection())
+        else:
+            db = await stack.enter_async_context(aiosqlite.connect(DB_NAME))
+        cursor = await stack.enter_async_context(db.execute(query, params))
+        while True:
+            rows = await cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            if chunks:
+                yield rows
+            else:
+                for row in rows:
+                    yield row
+
+
+_DONE = object()
+
+
+async def merge_streams(streams, buffer=64):
+    """Merge {tag: async iterable} into one stream of (tag, item) pairs.
+
+    Items are yielded in arrival order through a queue of at most
+    `buffer` items, so a slow consumer pauses the producers. Closing
+    the merged stream early cancels them.
+    """
+    queue = asyncio.Queue(maxsize=buffer)
+
+    async def produce(tag, stream):
+        try:
+            async for item in stream:
+                await queue.put((tag, item))
+        except Exception as e:
+            await queue.put((_DONE, e))
+        else:
+            await queue.put((_DONE, None))
+
+    producers = [asyncio.ensure_future(produce(tag, stream))
+                 for tag, stream in streams.items()]
+    try:
+        running = len(producers)
+        while running:
+            tag, item = await queue.get()
+            if tag is _DONE:
+                running -= 1
+                if item is not None:
+                    raise item
+                continue
+            yield tag, item
+    finally:
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+
+
+async def async_stream_users(pool=None, chunk_size=500):
+    async for user in stream_query("SELECT * FROM users", pool=pool,
+                                   chunk_size=chunk_size):
+        yield user
+
+
+async def async_stream_older_users(pool=None, chunk_size=500):
+    async for user in stream_query("SELECT * FROM users WHERE age > ?", (40,),
+                                   pool=pool, chunk_size=chunk_size):
+        yield user
+
+
+# Function 1: Fetch all users (pool may also be a QueryCoalescer)
+async def async_fetch_users(pool=None):
+    if pool is not None:
+        results = await pool.fetch("SELECT * FROM users")
+    else:
+        async with aiosqlite.connect(DB_NAME) as db:
+            async with db.execute("SELECT * FROM users") as cursor:
+                results = await cursor.fetchall()
+    print("✅ All Users:")
+    for user in results:
+        print(user)
+    return results
 
 # Function 2: Fetch users older than 40
-async def async_fetch_older_users():
-    async with aiosqlite.connect("users.db") as db:
-        async with db.execute("SELECT * FROM users WHERE age > 40") as cursor:
-            results = await cursor.fetchall()
-            print("\n👴 Users older than 40:")
-            for user in results:
-                print(user)
-            return results
+async def async_fetch_older_users(pool=None):
+    if pool is not None:
+        results = await pool.fetch("SELECT * FROM users WHERE age > 40")
+    else:
+        async with aiosqlite.connect(DB_NAME) as db:
+            async with db.execute("SELECT * FROM users WHERE age > 40") as cursor:
+                results = await cursor.fetchall()
+    print("\n👴 Users older than 40:")
+    for user in results:
+        print(user)
+    return results
 
 # Function to run both concurrently
 async def fetch_concurrently():
-    await asyncio.gather(
-        async_fetch_users(),
-        async_fetch_older_users()
-    )
+    async with AsyncConnectionPool(DB_NAME, size=2) as pool:
+        coalescer = QueryCoalescer(pool)  # both queries share one scan of users
+        await asyncio.gather(
+            async_fetch_users(coalescer),
+            async_fetch_older_users(coalescer)
+        )
+
+# Stream both queries at once without buffering either result
+async def stream_concurrently():
+    async with AsyncConnectionPool(DB_NAME, size=2) as pool:
+        merged = merge_streams({
+            "all": async_stream_users(pool),
+            "older": async_stream_older_users(pool),
+        })
+        async for tag, user in merged:
+            print(tag, user)
 
 # Run the concurrent fetch
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_execute_query():
+    # 1-execute.py is not importable by name, load it from its path
+    spec = importlib.util.spec_from_file_location(
+        "execute", os.path.join(HERE, "1-execute.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ExecuteQuery
+
+
+def build_table(db_name, rows):
+    """Create a users table with `rows` generated rows."""
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+    conn.executemany(
+        "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+        ((f"user{i}", f"user{i}@example.com", 18 + i % 60) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(label, ExecuteQuery, db_name, **options):
+    """Sum the ages of every row and report time and peak Python memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    total = 0
+    with ExecuteQuery("SELECT * FROM users", db_name=db_name, **options) as rows:
+        if options.get("batch_size"):
+            for batch in rows:
+                total += sum(row[3] for row in batch)
+        else:
+            for row in rows:
+                total += row[3]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28s} {elapsed:7.2f} s  peak {peak / 2**20:9.1f} MiB  (sum={total})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ExecuteQuery peak memory benchmark")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args(argv)
+
+    ExecuteQuery = load_execute_query()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "users.db")
+        print(f"Building a {args.rows:,}-row table...")
+        build_table(db_name, args.rows)
+        measure("fetchall", ExecuteQuery, db_name)
+        measure("stream arraysize=1000", ExecuteQuery, db_name, stream=True)
+        measure("batch_size=10000", ExecuteQuery, db_name, batch_size=10_000)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+import importlib.util
+
+from row_factories import ROW_FACTORIES, numpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_execute_query():
+    # 1-execute.py is not importable by name, load it from its path
+    spec = importlib.util.spec_from_file_location(
+        "execute", os.path.join(HERE, "1-execute.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ExecuteQuery
+
+
+def build_table(db_name, rows):
+    """Create a users table with `rows` generated rows."""
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER, score REAL)")
+    conn.executemany(
+        "INSERT INTO users (name, email, age, score) VALUES (?, ?, ?, ?)",
+        ((f"user{i}", f"user{i}@example.com", 18 + i % 60, i / 7) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(ExecuteQuery, db_name, row_factory):
+    """Time to build the full result and the memory it keeps alive."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with ExecuteQuery("SELECT * FROM users", db_name=db_name,
+                      row_factory=row_factory) as results:
+        elapsed = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    print(f"{row_factory:12s} {elapsed:7.2f} s  retained {retained / 2**20:8.1f} MiB"
+          f"  peak {peak / 2**20:8.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Row factory memory/time benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    ExecuteQuery = load_execute_query()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "users.db")
+        print(f"Building a {args.rows:,}-row table...")
+        build_table(db_name, args.rows)
+        for row_factory in ROW_FACTORIES:
+            if row_factory == "numpy" and numpy is None:
+                print("numpy        skipped, NumPy is not installed")
+                continue
+            measure(ExecuteQuery, db_name, row_factory)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
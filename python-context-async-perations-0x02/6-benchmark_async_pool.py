@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+import importlib.util
+
+import aiosqlite
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_concurrent():
+    # 3-concurrent.py is not importable by name, load it from its path
+    spec = importlib.util.spec_from_file_location(
+        "concurrent_fetch", os.path.join(HERE, "3-concurrent.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_table(db_name, rows):
+    """Create a users table with `rows` generated rows."""
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+    conn.executemany(
+        "INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+        ((f"user{i}", f"user{i}@example.com", 18 + i % 60) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def sample_threads(peak, stop):
+    while not stop.is_set():
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.001)
+
+
+async def measure(label, run, fan_out):
+    """Run `run()` and report queries per second and the peak thread count."""
+    peak, stop = [threading.active_count()], asyncio.Event()
+    sampler = asyncio.create_task(sample_threads(peak, stop))
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    print(f"{label:10s} fan-out {fan_out:5d}  {fan_out / elapsed:9.0f} queries/s"
+          f"  peak threads {peak[0]:5d}")
+
+
+async def main_async(db_name, fan_outs, pool_size, limit):
+    concurrent = load_concurrent()
+    query = "SELECT * FROM users WHERE id = ?"
+
+    async def one_connection_each(user_id):
+        async with aiosqlite.connect(db_name) as db:
+            async with db.execute(query, (user_id,)) as cursor:
+                return await cursor.fetchall()
+
+    for fan_out in fan_outs:
+        await measure("unpooled", lambda: asyncio.gather(
+            *(one_connection_each(i) for i in range(fan_out))), fan_out)
+        async with concurrent.AsyncConnectionPool(db_name, size=pool_size) as pool:
+            await measure("pooled", lambda: concurrent.run_queries(
+                [(query, (i,)) for i in range(fan_out)], pool, limit=limit), fan_out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="aiosqlite pool fan-out benchmark")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--fan-out", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "users.db")
+        build_table(db_name, args.rows)
+        asyncio.run(main_async(db_name, args.fan_out, args.pool_size, args.limit))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+import statistics
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+try:
+    import resource
+except ImportError:  # Windows: CPU used by child processes is not counted
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WORKLOADS = {
+    "point": ("SELECT * FROM users WHERE id = ?",
+              lambda rows, rng: (rng.randint(1, rows),)),
+    "range": ("SELECT * FROM users WHERE age BETWEEN ? AND ?",
+              lambda rows, rng: (lambda a: (a, a + 2))(rng.randint(18, 75))),
+    "aggregate": ("SELECT age, COUNT(*), AVG(score) FROM users GROUP BY age",
+                  lambda rows, rng: ()),
+}
+
+
+def load_concurrent():
+    # 3-concurrent.py is not importable by name, load it from its path
+    spec = importlib.util.spec_from_file_location(
+        "concurrent_fetch", os.path.join(HERE, "3-concurrent.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_table(db_name, rows):
+    """Create an indexed users table with `rows` generated rows."""
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER, score REAL)")
+    conn.executemany(
+        "INSERT INTO users (name, email, age, score) VALUES (?, ?, ?, ?)",
+        ((f"user{i}", f"user{i}@example.com", 18 + i % 60, i % 1000 / 10) for i in range(rows)),
+    )
+    conn.execute("CREATE INDEX idx_users_age ON users (age)")
+    conn.commit()
+    conn.close()
+
+
+# Every model gets its workers and connections up before the clock starts,
+# then runs all jobs at once. A query's latency goes from its submission to
+# its result, so the wait for a free worker (or asyncio slot) counts in all
+# three models alike. Each model returns (wall seconds, latencies).
+_local = threading.local()
+_worker_db = None
+
+
+def thread_connection(db_name):
+    # One connection per thread, opened on first use
+    if not hasattr(_local, "conn"):
+        _local.conn = sqlite3.connect(db_name)
+    return _local.conn
+
+
+def thread_query(db_name, query, params):
+    return thread_connection(db_name).execute(query, params).fetchall()
+
+
+def process_init(db_name):
+    global _worker_db
+    _worker_db = sqlite3.connect(db_name)
+
+
+def process_query(query, params):
+    return _worker_db.execute(query, params).fetchall()
+
+
+def process_warm(_):
+    time.sleep(0.05)  # long enough for every worker to get one
+
+
+def run_executor(pool, fn, calls):
+    """Submit every call at once, timing each one until its result."""
+    start = time.perf_counter()
+    submitted = {}
+    for args in calls:
+        submitted[pool.submit(fn, *args)] = time.perf_counter()
+    latencies = []
+    for future in as_completed(submitted):
+        latencies.append(time.perf_counter() - submitted[future])
+        future.result()
+    return time.perf_counter() - start, latencies
+
+
+def run_threads(db_name, jobs, concurrency):
+    with ThreadPoolExecutor(concurrency) as pool:
+        # The barrier holds each warm-up call until every thread has one
+        barrier = threading.Barrier(concurrency)
+        list(pool.map(lambda _: (thread_connection(db_name), barrier.wait()),
+                      range(concurrency)))
+        return run_executor(pool, thread_query, [(db_name, *job) for job in jobs])
+
+
+def run_processes(db_name, jobs, concurrency):
+    with ProcessPoolExecutor(concurrency, initializer=process_init,
+                             initargs=(db_name,)) as pool:
+        list(pool.map(process_warm, range(concurrency)))
+        return run_executor(pool, process_query, jobs)
+
+
+def run_asyncio(db_name, jobs, concurrency):
+    concurrent = load_concurrent()
+
+    async def main():
+        async with concurrent.AsyncConnectionPool(db_name, size=concurrency) as pool:
+            conns = await asyncio.gather(*(pool.acquire() for _ in range(concurrency)))
+            for conn in conns:
+                pool.release(conn)
+            semaphore = asyncio.Semaphore(concurrency)
+            start = time.perf_counter()
+
+            async def one(query, params):
+                async with semaphore:
+                    await pool.fetch(query, params)
+                return time.perf_counter() - start  # all were submitted at start
+
+            latencies = await asyncio.gather(*(one(*job) for job in jobs))
+            return time.perf_counter() - start, latencies
+
+    return asyncio.run(main())
+
+
+MODELS = {"asyncio": run_asyncio, "threads": run_threads, "processes": run_processes}
+
+
+def child_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure(model, workload, db_name, jobs, concurrency):
+    # Child CPU is only reported once the workers exit, so the CPU share is
+    # taken over the whole run, start-up included; q/s and latencies are not
+    cpu_start, child_start = time.process_time(), child_cpu()
+    start = time.perf_counter()
+    wall, latencies = MODELS[model](db_name, jobs, concurrency)
+    latencies = sorted(latencies)
+    total = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start + child_cpu() - child_start
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{workload:9s} {model:9s} c={concurrency:<3d} {len(jobs) / wall:9.0f} q/s"
+          f"  p50 {p50 * 1e3:7.3f} ms  p99 {p99 * 1e3:7.3f} ms  cpu {cpu / total:6.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio vs threads vs processes on SQLite reads")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--workload", choices=WORKLOADS, nargs="+", default=list(WORKLOADS))
+    parser.add_argument("--model", choices=MODELS, nargs="+", default=list(MODELS))
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "users.db")
+        print(f"Building a {args.rows:,}-row table...")
+        build_table(db_name, args.rows)
+        for workload in args.workload:
+            query, make_params = WORKLOADS[workload]
+            # Aggregates are far heavier than lookups, run fewer of them
+            count = args.queries if workload != "aggregate" else max(1, args.queries // 20)
+            jobs = [(query, make_params(args.rows, rng)) for _ in range(count)]
+            for concurrency in args.concurrency:
+                for model in args.model:
+                    measure(model, workload, db_name, jobs, concurrency)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+from array import array
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, columns stay as array/list
+    numpy = None
+
+ROW_FACTORIES = ("tuple", "dict", "namedtuple", "slots", "columnar", "numpy")
+
+_classes = {}  # (kind, column names) -> generated row class
+
+
+def column_names(cursor):
+    return tuple(column[0] for column in cursor.description)
+
+
+# 1️⃣ Row classes, generated once per column list
+def namedtuple_class(names):
+    key = ("namedtuple", names)
+    if key not in _classes:
+        _classes[key] = namedtuple("Row", names, rename=True)
+    return _classes[key]
+
+
+def slots_class(names):
+    """A small record class with __slots__ and one attribute per column."""
+    key = ("slots", names)
+    if key not in _classes:
+        # Reuse namedtuple's renaming so odd column names become valid fields
+        fields = namedtuple_class(names)._fields
+        args = ", ".join(fields)
+        body = "\n".join(f"    self.{f} = {f}" for f in fields) or "    pass"
+        namespace = {}
+        exec(f"def __init__(self, {args}):\n{body}", namespace)
+
+        def __iter__(self):
+            return (getattr(self, f) for f in fields)
+
+        def __eq__(self, other):
+            return type(self) is type(other) and tuple(self) == tuple(other)
+
+        def __repr__(self):
+            values = ", ".join(f"{f}={getattr(self, f)!r}" for f in fields)
+            return f"Record({values})"
+
+        _classes[key] = type("Record", (), {
+            "__slots__": fields,
+            "__init__": namespace["__init__"],
+            "__iter__": __iter__,
+            "__eq__": __eq__,
+            "__repr__": __repr__,
+            "__hash__": None,
+        })
+    return _classes[key]
+
+
+# 2️⃣ Converters for a list of tuples already fetched from a cursor
+def row_converter(kind, names):
+    """Return a function turning a list of tuples into a list of `kind` rows."""
+    if kind in (None, "tuple"):
+        return lambda rows: rows
+    if kind == "dict":
+        return lambda rows: [dict(zip(names, row)) for row in rows]
+    if kind == "namedtuple":
+        make = namedtuple_class(names)._make
+        return lambda rows: list(map(make, rows))
+    if kind == "slots":
+        cls = slots_class(names)
+        return lambda rows: [cls(*row) for row in rows]
+    if kind in ("columnar", "numpy"):
+        return lambda rows: to_columns(names, [rows], kind == "numpy")
+    raise ValueError(f"Unknown row factory {kind!r}, expected one of {ROW_FACTORIES}")
+
+
+def sqlite_row_factory(kind):
+    """Per-row factory for connection.row_factory (not for columnar)."""
+    if kind in (None, "tuple"):
+        return None
+    if kind in ("columnar", "numpy"):
+        raise ValueError("Columnar results are built per query, not per row")
+    if kind == "dict":
+        return lambda cursor, row: dict(zip(column_names(cursor), row))
+    if kind == "namedtuple":
+        return lambda cursor, row: namedtuple_class(column_names(cursor))._make(row)
+    if kind == "slots":
+        return lambda cursor, row: slots_class(column_names(cursor))(*row)
+    raise ValueError(f"Unknown row factory {kind!r}, expected one of {ROW_FACTORIES}")
+
+
+# 3️⃣ Columnar results: one array per column instead of one object per row
+_ARRAY_TYPES = {"q": int, "d": float}  # array typecode -> the only type it keeps
+
+
+def to_columns(names, chunks, use_numpy=False):
+    """Build {column: array/list} from an iterable of row chunks.
+
+    INTEGER columns become array('q') and REAL columns array('d'); a
+    column falls back to a list as soon as it sees NULL or mixed types.
+    """
+    columns = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        values_by_column = list(zip(*chunk))
+        if columns is None:
+            columns = []
+            for values in values_by_column:
+                first = values[0]
+                if type(first) is int:
+                    columns.append(array("q"))
+                elif type(first) is float:
+                    columns.append(array("d"))
+                else:
+                    columns.append([])
+        for i, values in enumerate(values_by_column):
+            column = columns[i]
+            if isinstance(column, array):
+                # array('d') would quietly take ints as floats, so check
+                # the exact types before extending rather than rely on a
+                # TypeError
+                if set(map(type, values)) == {_ARRAY_TYPES[column.typecode]}:
+                    size = len(column)
+                    try:
+                        column.extend(values)
+                        continue
+                    except OverflowError:
+                        # Drop whatever extend() appended before it failed
+                        del column[size:]
+                column = columns[i] = column.tolist()
+            column.extend(values)
+
+    if columns is None:
+        columns = [[] for _ in names]
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("row_factory='numpy' needs NumPy installed")
+        columns = [numpy.asarray(column) for column in columns]
+    return dict(zip(names, columns))
+
+
+def fetch_columns(cursor, use_numpy=False):
+    """Read the cursor in arraysize chunks straight into columns."""
+    chunks = iter(cursor.fetchmany, [])
+    return to_columns(column_names(cursor), chunks, use_numpy)
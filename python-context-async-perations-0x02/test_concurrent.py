@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Test module for 3-concurrent.py"""
+
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import tempfile
+import unittest
+
+_spec = importlib.util.spec_from_file_location(
+    "concurrent_queries",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "3-concurrent.py"))
+concurrent_queries = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(concurrent_queries)
+
+AsyncConnectionPool = concurrent_queries.AsyncConnectionPool
+QueryCoalescer = concurrent_queries.QueryCoalescer
+gather_within = concurrent_queries.gather_within
+run_queries = concurrent_queries.run_queries
+
+SLOW = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+        "WHERE x < 2000000) SELECT count(*) + ? FROM c")
+
+
+def make_db(path, users=200):
+    """A users table with an index-less age and a NOCASE name"""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, "
+                 "name TEXT COLLATE NOCASE, email TEXT, age INTEGER)")
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?, ?, ?)",
+        [(i, f"User{i}", None if i % 10 == 0 else f"u{i}@x.com", 20 + i % 50)
+         for i in range(users)])
+    conn.commit()
+    conn.close()
+
+
+def sqlite_rows(path, query, params=()):
+    """What SQLite itself returns"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestQueryCoalescer(unittest.IsolatedAsyncioTestCase):
+    """Test that coalesced reads answer exactly as SQLite does"""
+
+    async def asyncSetUp(self):
+        """A fresh database and pool per test"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.db")
+        make_db(self.path)
+        self.pool = AsyncConnectionPool(self.path, size=2)
+        self.coalescer = QueryCoalescer(self.pool, window=0.05)
+
+    async def asyncTearDown(self):
+        """Close the pool and drop the database"""
+        await self.pool.close()
+        self.tmp.cleanup()
+
+    async def fetch_all(self, *queries, return_exceptions=False):
+        """Run queries concurrently through the coalescer"""
+        return await asyncio.wait_for(asyncio.gather(
+            *(self.coalescer.fetch(q, p) for q, p in queries),
+            return_exceptions=return_exceptions), 5)
+
+    async def assertSameAsSQLite(self, *queries):
+        """Coalesced results equal SQLite's, query by query"""
+        results = await self.fetch_all(*queries)
+        for (query, params), rows in zip(queries, results):
+            self.assertEqual(rows, sqlite_rows(self.path, query, params))
+
+    async def test_shared_scan(self):
+        """Test that full-scan reads of one table share one scan"""
+        await self.assertSameAsSQLite(
+            ("SELECT * FROM users WHERE age > ?", (40,)),
+            ("SELECT id, name FROM users WHERE age <= 30", ()),
+            ("SELECT * FROM users", ()))
+        self.assertEqual(self.coalescer.stats["shared_scans"], 1)
+        self.assertEqual(self.coalescer.stats["served_by_scans"], 3)
+
+    async def test_index_lookups_not_merged(self):
+        """Test that primary-key SEARCHes are not turned into a scan"""
+        await self.assertSameAsSQLite(
+            ("SELECT * FROM users WHERE id = ?", (5,)),
+            ("SELECT * FROM users WHERE id = ?", (6,)))
+        self.assertEqual(self.coalescer.stats["shared_scans"], 0)
+        self.assertEqual(self.coalescer.stats["direct"], 2)
+
+    async def test_collation(self):
+        """Test that NOCASE columns are compared by SQLite"""
+        await self.assertSameAsSQLite(
+            ("SELECT * FROM users WHERE name = 'user5'", ()),
+            ("SELECT * FROM users WHERE name > ?", ("user50",)))
+        self.assertEqual(self.coalescer.stats["served_by_scans"], 0)
+
+    async def test_null_parameter(self):
+        """Test that NULL parameters neither hang nor match"""
+        await self.assertSameAsSQLite(
+            ("SELECT * FROM users WHERE email = ?", (None,)),
+            ("SELECT * FROM users WHERE email = ?", ("u5@x.com",)),
+            ("SELECT * FROM users WHERE age = ?", (30,)))
+
+    async def test_unsupported_parameter(self):
+        """Test that a bad parameter fails instead of hanging"""
+        bad, good = await self.fetch_all(
+            ("SELECT * FROM users WHERE age = ?", (object(),)),
+            ("SELECT * FROM users WHERE age = ?", (30,)),
+            return_exceptions=True)
+        self.assertIsInstance(bad, sqlite3.Error)
+        self.assertEqual(good, sqlite_rows(
+            self.path, "SELECT * FROM users WHERE age = ?", (30,)))
+
+    async def test_named_parameters(self):
+        """Test that named parameters with different values stay apart"""
+        query = "SELECT * FROM users WHERE id = :id"
+        await self.assertSameAsSQLite((query, {"id": 1}), (query, {"id": 2}))
+        self.assertEqual(self.coalescer.stats["deduplicated"], 0)
+
+    async def test_unhashable_parameter(self):
+        """Test that unhashable parameters reach SQLite instead of failing"""
+        with self.assertRaises(sqlite3.Error):
+            await self.fetch_all(("SELECT * FROM users WHERE id = ?", [[1]]))
+
+    async def test_cancelled_first_caller(self):
+        """Test that cancelling the first caller does not strand the rest"""
+        first = asyncio.ensure_future(self.coalescer.fetch(SLOW, (1,)))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(self.coalescer.fetch(SLOW, (1,)))
+        await asyncio.sleep(0)
+        first.cancel()
+        rows = await asyncio.wait_for(second, 30)
+        self.assertEqual(rows, sqlite_rows(self.path, SLOW, (1,)))
+        self.assertEqual(await asyncio.wait_for(
+            self.coalescer.fetch(SLOW, (1,)), 30), rows)
+
+
+class TestDeadlines(unittest.IsolatedAsyncioTestCase):
+    """Test that deadlines cover the whole wait, queueing included"""
+
+    async def asyncSetUp(self):
+        """A fresh database per test"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "users.db")
+        make_db(self.path)
+
+    async def asyncTearDown(self):
+        """Drop the database"""
+        self.tmp.cleanup()
+
+    async def timed(self, coro):
+        """Result of coro and the seconds it took"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await coro
+        return result, loop.time() - start
+
+    async def test_batch_deadline_covers_pool_wait(self):
+        """Test that queued queries give up at the batch deadline"""
+        async with AsyncConnectionPool(self.path, size=1) as pool:
+            results, elapsed = await self.timed(gather_within(
+                [(SLOW, (1,))] * 4, pool, timeout=0.3))
+        self.assertLess(elapsed, 0.6)
+        for result in results:
+            self.assertIsInstance(result, asyncio.TimeoutError)
+
+    async def test_query_timeout_covers_semaphore(self):
+        """Test that a per-query timeout starts before the slot wait"""
+        async with AsyncConnectionPool(self.path, size=3) as pool:
+            results, elapsed = await self.timed(run_queries(
+                [(SLOW, (1,))] * 3, pool, limit=1, timeout=0.2,
+                return_exceptions=True))
+        self.assertLess(elapsed, 0.5)
+        for result in results:
+            self.assertIsInstance(result, asyncio.TimeoutError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,149 @@
+import queue
 import sqlite3
 import functools
+import threading
+import contextlib
+import contextvars
+
+DB_NAME = "database.db"  # change DB name as needed
+READER_POOL_SIZE = 4
+READER_TIMEOUT = 5.0  # seconds to wait for a free reader
+
+# One writer connection shared by every write, guarded by a lock
+_writer = None
+_writer_lock = threading.RLock()
+# Read-only connections (mode=ro), handed out from a pool
+_readers = queue.Queue()
+_readers_opened = 0
+_readers_lock = threading.Lock()
+# The current request_scope(), if any
+_scope = contextvars.ContextVar("scope", default=None)
+
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        _writer = sqlite3.connect(DB_NAME, check_same_thread=False)
+        # WAL lets readers keep reading while the writer holds its lock
+        _writer.execute("PRAGMA journal_mode=WAL")
+    return _writer
+
+
+def _acquire_reader():
+    global _readers_opened
+    with _readers_lock:
+        if _readers.empty() and _readers_opened < READER_POOL_SIZE:
+            _readers_opened += 1
+            return sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True,
+                                   check_same_thread=False)
+    try:
+        return _readers.get(timeout=READER_TIMEOUT)
+    except queue.Empty:
+        raise TimeoutError(
+            f"No reader connection to {DB_NAME} free after {READER_TIMEOUT}s")
+
+
+def _release_reader(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    _readers.put(conn)
+
+
+def close_connections():
+    """Close the writer and every pooled reader."""
+    global _writer, _readers_opened
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+    with _readers_lock:
+        while not _readers.empty():
+            _readers.get_nowait().close()
+            _readers_opened -= 1
+
+
+class _Scope:
+    wrote = False
+
+
+@contextlib.contextmanager
+def request_scope():
+    """Reads after a write in this scope go to the writer (read-your-writes).
+
+    From its first write on, the scope keeps the writer to itself and its
+    writes stay uncommitted; they are committed when the scope exits, or
+    rolled back if it exits with an exception. Nobody outside the scope
+    ever sees them half done.
+
+    A scope opened inside another one joins it: only the outermost scope
+    commits or rolls back.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    scope = _Scope()
+    token = _scope.set(scope)
+    try:
+        yield
+    except BaseException:
+        if scope.wrote and _writer is not None and _writer.in_transaction:
+            _writer.rollback()
+        raise
+    else:
+        if scope.wrote and _writer is not None and _writer.in_transaction:
+            _writer.commit()
+    finally:
+        _scope.reset(token)
+        if scope.wrote:
+            _writer_lock.release()
+
+
+# Mark a function as read-only so it is routed to the reader pool
+def read_only(func):
+    func.read_only = True
+    return func
+
 
 # Decorator to handle database connection
 def with_db_connection(func):
+    is_read_only = getattr(func, "read_only", False)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        # Open database connection
-        conn = sqlite3.connect("database.db")  # change DB name as needed
-        try:
-            # Pass connection as first argument to the function
-            return func(conn, *args, **kwargs)
-        finally:
-            # Close the connection after function completes
-            conn.close()
+        scope = _scope.get()
+        if is_read_only and not (scope and scope.wrote):
+            conn = _acquire_reader()
+            try:
+                # Pass connection as first argument to the function
+                return func(conn, *args, **kwargs)
+            finally:
+                _release_reader(conn)
+
+        if scope is not None and not scope.wrote:
+            # Held until the scope exits, released by request_scope()
+            _writer_lock.acquire()
+            scope.wrote = True
+        with _writer_lock:
+            conn = _get_writer()
+            try:
+                return func(conn, *args, **kwargs)
+            finally:
+                # Outside a scope, whatever the call did not commit is
+                # discarded, as closing a per-call connection used to do
+                if scope is None and conn.in_transaction:
+                    conn.rollback()
     return wrapper
 
+
 # Decorated function
 @with_db_connection
+@read_only
 def get_user_by_id(conn, user_id):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
     return cursor.fetchone()
 
+
 # Fetch user
 user = get_user_by_id(user_id=1)
 print(user)
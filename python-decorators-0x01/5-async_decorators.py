@@ -0,0 +1,297 @@
+import time
+import asyncio
+import sqlite3
+import inspect
+import weakref
+import functools
+from datetime import datetime
+
+import aiosqlite
+
+DB_NAME = "database.db"  # change DB name if needed
+
+
+# 1️⃣ Async connection pool (one per event loop, aiosqlite connections are loop bound)
+class AsyncConnectionPool:
+    def __init__(self, db_name=DB_NAME, size=5):
+        self.db_name = db_name
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._opened = 0
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    async def acquire(self):
+        """Hand out an idle connection, opening a new one while under the limit."""
+        if self._idle.empty():
+            async with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return await aiosqlite.connect(self.db_name)
+                    except Exception:
+                        self._opened -= 1
+                        raise
+        return await self._idle.get()
+
+    async def release(self, conn):
+        """Return a connection, rolling back anything the caller left open."""
+        if conn.in_transaction:
+            await conn.rollback()
+        if self._closed:  # checked out while the pool was closed
+            await conn.close()
+            self._opened -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    async def close(self):
+        self._closed = True
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            await conn.close()
+            self._opened -= 1
+
+
+_async_pools = weakref.WeakKeyDictionary()  # event loop -> {db_name: pool}
+
+
+def get_async_pool(db_name=DB_NAME):
+    loop = asyncio.get_running_loop()
+    if loop not in _async_pools:
+        _async_pools[loop] = {}
+        _spawn(_close_at_shutdown())
+    pools = _async_pools[loop]
+    if db_name not in pools:
+        pools[db_name] = AsyncConnectionPool(db_name)
+    return pools[db_name]
+
+
+async def close_async_pools():
+    """Close every pooled connection opened on the running event loop."""
+    pools = _async_pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.close()
+
+
+async def _close_at_shutdown():
+    # asyncio.run() cancels the tasks left on its way out: close the loop's pools
+    # then, or the aiosqlite connection threads keep the interpreter from exiting
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await close_async_pools()
+
+
+def _query_from(args, kwargs):
+    # Same lookup as 0-log_queries: keyword first, then the first positional
+    query = kwargs.get('query') or (args[0] if args else None)
+    return query if isinstance(query, str) else None
+
+
+# 2️⃣ Decorator to log SQL queries
+def log_queries(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            query = _query_from(args, kwargs)
+            if query:
+                print(f"[{datetime.now()}] Executing SQL query: {query}")
+            return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        query = _query_from(args, kwargs)
+        if query:
+            print(f"[{datetime.now()}] Executing SQL query: {query}")
+        return func(*args, **kwargs)
+    return wrapper
+
+
+_borrowed = {}  # pooled connection -> shared cache_query task running on it
+_background = set()  # keeps fire-and-forget releases alive until they finish
+
+
+def _spawn(coro):
+    task = asyncio.ensure_future(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+# 3️⃣ Decorator to handle database connection
+def with_db_connection(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            pool = get_async_pool(DB_NAME)
+            conn = await pool.acquire()
+            try:
+                return await func(conn, *args, **kwargs)
+            finally:
+                task = _borrowed.pop(conn, None)
+                if task is None:
+                    await pool.release(conn)
+                else:
+                    # A shared cache_query execution still runs on conn (we were
+                    # cancelled), hand it back to the pool once that is done
+                    task.add_done_callback(lambda _: _spawn(pool.release(conn)))
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = sqlite3.connect(DB_NAME)
+        try:
+            return func(conn, *args, **kwargs)
+        finally:
+            conn.close()
+    return wrapper
+
+
+# 4️⃣ Decorator to manage transactions
+def transactional(func):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(conn, *args, **kwargs):
+            try:
+                result = await func(conn, *args, **kwargs)
+                await conn.commit()
+                return result
+            except Exception as e:
+                await conn.rollback()
+                print(f"Transaction failed: {e}")
+                raise
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(conn, *args, **kwargs):
+        try:
+            result = func(conn, *args, **kwargs)
+            conn.commit()
+            return result
+        except Exception as e:
+            conn.rollback()
+            print(f"Transaction failed: {e}")
+            raise
+    return wrapper
+
+
+# 5️⃣ Decorator to retry function on failure (asyncio.sleep keeps the loop free)
+def retry_on_failure(retries=3, delay=2):
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                last_exception = None
+                for attempt in range(1, retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        last_exception = e
+                        print(f"Attempt {attempt} failed: {e}")
+                        if attempt < retries:
+                            print(f"Retrying in {delay} seconds...")
+                            await asyncio.sleep(delay)
+                raise last_exception
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            last_exception = None
+            for attempt in range(1, retries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    last_exception = e
+                    print(f"Attempt {attempt} failed: {e}")
+                    if attempt < retries:
+                        print(f"Retrying in {delay} seconds...")
+                        time.sleep(delay)
+            raise last_exception
+        return wrapper
+    return decorator
+
+
+# 6️⃣ Decorator to cache query results (single-flight for coroutines)
+query_cache = {}
+_inflight = {}  # query -> task currently computing it
+
+
+def cache_query(func):
+    if inspect.iscoroutinefunction(func):
+        def settle(query, conn, task):
+            _inflight.pop(query, None)
+            if _borrowed.get(conn) is task:
+                del _borrowed[conn]
+            if not task.cancelled() and task.exception() is None:
+                query_cache[query] = task.result()
+                print(f"Caching result for query: {query}")
+
+        @functools.wraps(func)
+        async def async_wrapper(conn, query, *args, **kwargs):
+            if query in query_cache:
+                print(f"Using cached result for query: {query}")
+                return query_cache[query]
+
+            task = _inflight.get(query)
+            if task is not None:
+                # Someone is already running this query, wait for their result
+                print(f"Joining in-flight query: {query}")
+                return await asyncio.shield(task)
+
+            # Shielded so cancelling this caller doesn't cancel everyone joined
+            # on it; conn stays out of the pool until the execution finishes
+            task = asyncio.ensure_future(func(conn, query, *args, **kwargs))
+            _inflight[query] = task
+            _borrowed[conn] = task
+            task.add_done_callback(functools.partial(settle, query, conn))
+            return await asyncio.shield(task)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(conn, query, *args, **kwargs):
+        if query in query_cache:
+            print(f"Using cached result for query: {query}")
+            return query_cache[query]
+        result = func(conn, query, *args, **kwargs)
+        query_cache[query] = result
+        print(f"Caching result for query: {query}")
+        return result
+    return wrapper
+
+
+# 7️⃣ Decorated coroutine functions
+@with_db_connection
+@retry_on_failure(retries=3, delay=1)
+async def async_fetch_users_with_retry(conn):
+    async with conn.execute("SELECT * FROM users") as cursor:
+        return await cursor.fetchall()
+
+
+@with_db_connection
+@transactional
+async def async_update_user_email(conn, user_id, new_email):
+    await conn.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
+    print(f"User {user_id} email updated to {new_email}")
+
+
+@with_db_connection
+@cache_query
+async def async_fetch_users_with_cache(conn, query):
+    async with conn.execute(query) as cursor:
+        return await cursor.fetchall()
+
+
+async def main():
+    users = await async_fetch_users_with_retry()
+    print(users)
+    # Both calls share one execution, the third one is served from the cache
+    await asyncio.gather(
+        async_fetch_users_with_cache(query="SELECT * FROM users"),
+        async_fetch_users_with_cache(query="SELECT * FROM users"),
+    )
+    await async_fetch_users_with_cache(query="SELECT * FROM users")
+    await close_async_pools()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+import re
+import time
+import sqlite3
+import functools
+
+# 1️⃣ Plan cache and per-shape statistics
+query_plans = {}   # query shape -> (plan rows, flags)
+query_stats = {}   # query shape -> [calls, total seconds]
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+def query_shape(query):
+    """Normalize a query so calls that differ only by literals share a plan."""
+    return _SPACES.sub(" ", _LITERALS.sub("?", query)).strip()
+
+
+def explain(conn, query, params=()):
+    """Run EXPLAIN QUERY PLAN once and flag the expensive steps."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    flags = []
+    for row in rows:
+        detail = row[-1]
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            flags.append(f"full scan: {detail}")
+        if "AUTOMATIC" in detail:
+            flags.append(f"missing index: {detail}")
+        if "TEMP B-TREE" in detail:
+            flags.append(f"temp b-tree: {detail}")
+    # A filtered query that still scans the whole table wants an index
+    # (checked on the shape: any whitespace counts, literals can't match)
+    if _WHERE.search(query_shape(query)) and any(f.startswith("full scan") for f in flags):
+        flags.append("missing index: WHERE clause is not served by an index")
+    return rows, flags
+
+
+# 2️⃣ Connection/cursor proxies that time every statement
+class ProfilingCursor:
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        shape = query_shape(query)
+        if shape not in query_plans:
+            try:
+                query_plans[shape] = explain(self._conn, query, params)
+            except sqlite3.Error as e:
+                query_plans[shape] = ([], [f"explain failed: {e}"])
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params)
+        finally:
+            stats = query_stats.setdefault(shape, [0, 0.0])
+            stats[0] += 1
+            stats[1] += time.perf_counter() - start
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ProfilingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return ProfilingCursor(self._conn, self._conn.cursor(*args, **kwargs))
+
+    def execute(self, query, params=()):
+        return self.cursor().execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# 3️⃣ Decorator that profiles every query the function runs
+def profile_query_plan(func):
+    @functools.wraps(func)
+    def wrapper(conn, *args, **kwargs):
+        if not isinstance(conn, ProfilingConnection):
+            conn = ProfilingConnection(conn)
+        return func(conn, *args, **kwargs)
+    return wrapper
+
+
+def query_plan_report(top=10):
+    """Flagged query shapes, worst first by total time (calls x average time)."""
+    offenders = []
+    for shape, (plan, flags) in query_plans.items():
+        if not flags:
+            continue
+        calls, total = query_stats.get(shape, (0, 0.0))
+        offenders.append((total, calls, shape, flags))
+    offenders.sort(key=lambda o: (o[0], o[1]), reverse=True)
+
+    lines = []
+    for total, calls, shape, flags in offenders[:top]:
+        lines.append(f"{total * 1000:9.2f} ms  {calls:6d} calls  {shape}")
+        lines.extend(f"{'':28}- {flag}" for flag in flags)
+    return "\n".join(lines) or "No flagged queries."
+
+
+# 4️⃣ Decorator to handle database connection
+def with_db_connection(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = sqlite3.connect("database.db")  # change DB name if needed
+        try:
+            return func(conn, *args, **kwargs)
+        finally:
+            conn.close()
+    return wrapper
+
+
+@with_db_connection
+@profile_query_plan
+def get_user_by_id(conn, user_id):
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+    return cursor.fetchone()
+
+
+@with_db_connection
+@profile_query_plan
+def get_users_by_email(conn, email):
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users WHERE email = ? ORDER BY name", (email,))
+    return cursor.fetchall()
+
+
+if __name__ == "__main__":
+    for user_id in range(1, 4):
+        print(get_user_by_id(user_id=user_id))
+    print(get_users_by_email(email="Crawford_Cartwright@hotmail.com"))
+    print(query_plan_report())
@@ -0,0 +1,210 @@
+import time
+import sqlite3
+import functools
+import timeit
+from datetime import datetime
+
+DB_NAME = "database.db"  # change DB name if needed
+
+query_cache = {}
+
+
+# 1️⃣ The stacked decorators, as in the earlier tasks
+def log_queries(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        query = kwargs.get('query') or (args[0] if args else None)
+        if query:
+            print(f"[{datetime.now()}] Executing SQL query: {query}")
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def with_db_connection(func, connect=None):
+    connect = connect or functools.partial(sqlite3.connect, DB_NAME)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = connect()
+        try:
+            return func(conn, *args, **kwargs)
+        finally:
+            conn.close()
+    return wrapper
+
+
+def cache_query(func):
+    @functools.wraps(func)
+    def wrapper(conn, query, *args, **kwargs):
+        if query in query_cache:
+            print(f"Using cached result for query: {query}")
+            return query_cache[query]
+        result = func(conn, query, *args, **kwargs)
+        query_cache[query] = result
+        print(f"Caching result for query: {query}")
+        return result
+    return wrapper
+
+
+def retry_on_failure(retries=3, delay=2):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            last_exception = None
+            for attempt in range(1, retries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    last_exception = e
+                    print(f"Attempt {attempt} failed: {e}")
+                    if attempt < retries:
+                        print(f"Retrying in {delay} seconds...")
+                        time.sleep(delay)
+            raise last_exception
+        return wrapper
+    return decorator
+
+
+def transactional(func):
+    @functools.wraps(func)
+    def wrapper(conn, *args, **kwargs):
+        try:
+            result = func(conn, *args, **kwargs)
+            conn.commit()
+            return result
+        except Exception as e:
+            conn.rollback()
+            print(f"Transaction failed: {e}")
+            raise
+    return wrapper
+
+
+# 2️⃣ The same policy compiled into a single wrapper
+def db_policy(connection=True, transaction=False, retries=None, delay=2,
+              cache=False, log=False, connect=None):
+    """Fuse the decorators into one wrapper.
+
+    Behaves like stacking them in this order, outermost first:
+
+        @log_queries
+        @with_db_connection
+        @cache_query
+        @retry_on_failure(retries, delay)
+        @transactional
+
+    Layers left at their default (None/False) are skipped, arguments
+    are packed once and there is a single try/finally per call. Cache
+    hits are answered before a connection is opened.
+    """
+    connect = connect or functools.partial(sqlite3.connect, DB_NAME)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not connection:
+                # The caller passes the connection as the first argument;
+                # take it out before anything looks for the query
+                conn, args = args[0], args[1:]
+
+            if log:
+                query = kwargs.get('query') or (args[0] if args else None)
+                if query:
+                    print(f"[{datetime.now()}] Executing SQL query: {query}")
+
+            if cache:
+                if 'query' in kwargs:
+                    query = kwargs.pop('query')
+                else:
+                    query, args = args[0], args[1:]
+                if query in query_cache:
+                    print(f"Using cached result for query: {query}")
+                    return query_cache[query]
+                args = (query,) + args
+
+            if connection:
+                conn = connect()
+            try:
+                last_exception = None
+                for attempt in range(1, (retries or 1) + 1):
+                    try:
+                        result = func(conn, *args, **kwargs)
+                        if transaction:
+                            conn.commit()
+                        break
+                    except Exception as e:
+                        if transaction:
+                            conn.rollback()
+                            print(f"Transaction failed: {e}")
+                        if not retries:
+                            raise
+                        last_exception = e
+                        print(f"Attempt {attempt} failed: {e}")
+                        if attempt < retries:
+                            print(f"Retrying in {delay} seconds...")
+                            time.sleep(delay)
+                else:
+                    raise last_exception
+            finally:
+                if connection:
+                    conn.close()
+
+            if cache:
+                query_cache[query] = result
+                print(f"Caching result for query: {query}")
+            return result
+        return wrapper
+    return decorator
+
+
+# 3️⃣ Microbenchmark: per-call overhead of stacked vs fused wrappers
+class _NullConnection:
+    """Stands in for sqlite3 so only the wrapper overhead is measured."""
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def benchmark(number=200_000):
+    null_connect = _NullConnection
+
+    def body(conn, user_id):
+        return user_id
+
+    stacked = with_db_connection(
+        retry_on_failure(retries=3, delay=1)(transactional(body)),
+        connect=null_connect,
+    )
+    fused = db_policy(transaction=True, retries=3, delay=1,
+                      connect=null_connect)(body)
+
+    results = {"bare": timeit.timeit(lambda: body(None, 1), number=number)}
+    results["stacked"] = timeit.timeit(lambda: stacked(1), number=number)
+    results["fused"] = timeit.timeit(lambda: fused(1), number=number)
+    for name, seconds in results.items():
+        print(f"{name:8s} {seconds / number * 1e9:8.1f} ns/call")
+    return results
+
+
+# 4️⃣ Decorated function
+@db_policy(retries=3, delay=1)
+def fetch_users_with_retry(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users")
+    return cursor.fetchall()
+
+
+@db_policy(cache=True, log=True)
+def fetch_users_with_cache(conn, query):
+    cursor = conn.cursor()
+    cursor.execute(query)
+    return cursor.fetchall()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,212 @@
+import sqlite3
+import functools
+import threading
+import contextvars
+from collections.abc import Mapping
+from concurrent.futures import Future
+
+DB_NAME = "database.db"  # change DB name if needed
+
+_current_batch = contextvars.ContextVar("current_batch", default=None)
+_window_batch = None  # batch shared by every thread while a window is open
+
+
+def _no_result(what):
+    raise TypeError(
+        f"{what} is not available inside a batch: batched functions only "
+        "record their writes, run it outside the batch if it needs results"
+    )
+
+
+def _bound(params):
+    # Named parameters stay a dict, tuple() would keep only their keys
+    return dict(params) if isinstance(params, Mapping) else tuple(params)
+
+
+# 1️⃣ Connection stand-in that records statements instead of running them.
+# Nothing runs until the flush, so there is no result to read: rowcount,
+# lastrowid and fetch* raise instead of handing back made-up values.
+class RecordingConnection:
+    rowcount = property(lambda self: _no_result("cursor.rowcount"))
+    lastrowid = property(lambda self: _no_result("cursor.lastrowid"))
+
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.statements.append((query, _bound(params)))
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self.statements.extend((query, _bound(p)) for p in seq_of_params)
+        return self
+
+    def fetchone(self):
+        _no_result("fetchone()")
+
+    def fetchmany(self, size=None):
+        _no_result("fetchmany()")
+
+    def fetchall(self):
+        _no_result("fetchall()")
+
+    def __iter__(self):
+        _no_result("Iterating a cursor")
+
+    def commit(self):
+        pass  # the batch commits once for everybody
+
+    def rollback(self):
+        pass
+
+
+# 2️⃣ A batch of recorded writes flushed as executemany in one transaction
+class WriteBatch:
+    def __init__(self, db_name=DB_NAME, max_size=500, max_delay=None):
+        self.db_name = db_name
+        self.max_size = max_size      # flush once this many calls are queued
+        self.max_delay = max_delay    # ...or this many seconds after the first
+        self._items = []              # (future, return value, statements)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, func, args, kwargs):
+        """Run func against a recording connection and queue its statements."""
+        recorder = RecordingConnection()
+        value = func(recorder, *args, **kwargs)
+        future = Future()
+        with self._lock:
+            self._items.append((future, value, recorder.statements))
+            full = len(self._items) >= self.max_size
+            if not full and self.max_delay is not None and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_quietly)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._flush_quietly()
+        return future
+
+    def flush(self):
+        with self._lock:
+            items, self._items = self._items, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not items:
+            return
+
+        # Consecutive calls issuing the same SQL become one executemany,
+        # so statement order is kept when functions mix different writes
+        groups = []
+        for _, _, statements in items:
+            for query, params in statements:
+                if groups and groups[-1][0] == query:
+                    groups[-1][1].append(params)
+                else:
+                    groups.append((query, [params]))
+
+        conn = sqlite3.connect(self.db_name)
+        try:
+            cursor = conn.cursor()
+            for query, rows in groups:
+                cursor.executemany(query, rows)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Transaction failed: {e}")
+            for future, _, _ in items:
+                future.set_exception(e)
+            raise
+        finally:
+            conn.close()
+        print(f"Flushed {len(items)} calls as {len(groups)} executemany")
+        for future, value, _ in items:
+            future.set_result(value)
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except Exception:
+            pass  # already delivered to every pending future
+
+    def __enter__(self):
+        self._token = _current_batch.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_batch.reset(self._token)
+        if exc_type is None:
+            self.flush()
+        else:
+            with self._lock:
+                items, self._items = self._items, []
+            for future, _, _ in items:
+                future.cancel()
+        return False
+
+
+def open_batch_window(max_size=500, max_delay=0.05, db_name=DB_NAME):
+    """Batch calls from every thread, flushing by size or after max_delay.
+
+    A window already open is flushed first, its writes are not left behind.
+    """
+    global _window_batch
+    previous = _window_batch
+    _window_batch = WriteBatch(db_name, max_size=max_size, max_delay=max_delay)
+    if previous is not None:
+        previous.flush()
+    return _window_batch
+
+
+def close_batch_window():
+    global _window_batch
+    batch, _window_batch = _window_batch, None
+    if batch is not None:
+        batch.flush()
+
+
+# 3️⃣ Decorator: batched inside a batch, connection + transaction otherwise.
+# Inside a batch the Future resolves to what func returned after recording its
+# writes, so func must not depend on cursor results (those raise TypeError).
+def batchable(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        batch = _current_batch.get() or _window_batch
+        if batch is not None:
+            return batch.add(func, args, kwargs)  # Future with the item result
+
+        conn = sqlite3.connect(DB_NAME)
+        try:
+            result = func(conn, *args, **kwargs)
+            conn.commit()
+            return result
+        except Exception as e:
+            conn.rollback()
+            print(f"Transaction failed: {e}")
+            raise
+        finally:
+            conn.close()
+    return wrapper
+
+
+@batchable
+def update_user_email(conn, user_id, new_email):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
+    return user_id
+
+
+if __name__ == "__main__":
+    # Single call: one connection, one transaction, as before
+    update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
+
+    # Bulk job: one executemany in one transaction
+    with WriteBatch() as batch:
+        results = [
+            update_user_email(user_id=i, new_email=f"user{i}@example.com")
+            for i in range(1, 101)
+        ]
+    print([r.result() for r in results][:5])
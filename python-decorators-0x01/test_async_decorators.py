@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test module for 5-async_decorators.py"""
+
+import asyncio
+import contextlib
+import importlib.util
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "5-async_decorators.py")
+_spec = importlib.util.spec_from_file_location("async_decorators", MODULE_PATH)
+async_decorators = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(async_decorators)
+
+SLOW = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+        "WHERE x < 2000000) SELECT count(*) FROM c")
+
+
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+    conn.execute("INSERT INTO users VALUES (1, 'a@example.com')")
+    conn.commit()
+    conn.close()
+
+
+class TestAsyncDecorators(unittest.IsolatedAsyncioTestCase):
+    """The async decorators against a throwaway database"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_name = os.path.join(tmp.name, "database.db")
+        make_db(self.db_name)
+        old_name = async_decorators.DB_NAME
+        async_decorators.DB_NAME = self.db_name
+        self.addCleanup(setattr, async_decorators, "DB_NAME", old_name)
+        async_decorators.query_cache.clear()
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    async def asyncTearDown(self):
+        await async_decorators.close_async_pools()
+
+    async def test_cancelled_first_caller(self):
+        """Cancelling the first caller of a shared query spares the others"""
+        fetch = async_decorators.async_fetch_users_with_cache
+        first = asyncio.ensure_future(fetch(query=SLOW))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(fetch(query=SLOW))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        self.assertEqual(await asyncio.wait_for(second, 30), [(2000000,)])
+        await asyncio.sleep(0.05)
+        self.assertEqual(async_decorators._borrowed, {})
+
+    def test_exits_without_closing_pools(self):
+        """asyncio.run() alone closes the pooled connections"""
+        script = (
+            "import asyncio, importlib.util, sys\n"
+            "spec = importlib.util.spec_from_file_location('m', sys.argv[1])\n"
+            "m = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(m)\n"
+            "m.DB_NAME = sys.argv[2]\n"
+            "print(asyncio.run(m.async_fetch_users_with_retry()))\n")
+        done = subprocess.run(
+            [sys.executable, "-c", script, MODULE_PATH, self.db_name],
+            capture_output=True, text=True, timeout=30)
+        self.assertEqual(done.returncode, 0, done.stderr)
+        self.assertIn("a@example.com", done.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
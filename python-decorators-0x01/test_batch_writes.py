@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Test module for 8-batch_writes.py"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+_spec = importlib.util.spec_from_file_location(
+    "batch_writes",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "8-batch_writes.py"))
+batch_writes = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batch_writes)
+
+
+@batch_writes.batchable
+def update_named(conn, user_id, new_email):
+    conn.execute("UPDATE users SET email = :email WHERE id = :id",
+                 {"email": new_email, "id": user_id})
+    return user_id
+
+
+@batch_writes.batchable
+def update_many_named(conn, updates):
+    conn.executemany("UPDATE users SET email = :email WHERE id = :id",
+                     [{"email": e, "id": i} for i, e in updates])
+
+
+class TestWriteBatch(unittest.TestCase):
+    """Writes recorded in a batch land in the database on flush"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_name = os.path.join(tmp.name, "users.db")
+        conn = sqlite3.connect(self.db_name)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        conn.executemany("INSERT INTO users VALUES (?, ?)",
+                         [(i, f"old{i}") for i in range(1, 4)])
+        conn.commit()
+        conn.close()
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def emails(self):
+        conn = sqlite3.connect(self.db_name)
+        try:
+            return dict(conn.execute("SELECT id, email FROM users"))
+        finally:
+            conn.close()
+
+    def test_named_parameters(self):
+        """Named parameters bind their values, not their names"""
+        with batch_writes.WriteBatch(self.db_name) as batch:
+            first = update_named(1, "a@example.com")
+            update_many_named([(2, "b@example.com"), (3, "c@example.com")])
+        self.assertEqual(first.result(), 1)
+        self.assertEqual(self.emails(), {1: "a@example.com", 2: "b@example.com",
+                                         3: "c@example.com"})
+
+    def test_positional_parameters(self):
+        """The module's own update_user_email still works in a batch"""
+        with batch_writes.WriteBatch(self.db_name):
+            for i in range(1, 4):
+                batch_writes.update_user_email(user_id=i, new_email=f"new{i}")
+        self.assertEqual(self.emails(), {1: "new1", 2: "new2", 3: "new3"})
+
+    def test_reopened_window_flushes_previous(self):
+        """Opening a window again runs the writes of the one it replaces"""
+        batch_writes.open_batch_window(max_delay=None, db_name=self.db_name)
+        self.addCleanup(batch_writes.close_batch_window)
+        pending = update_named(1, "first@example.com")
+        batch_writes.open_batch_window(max_delay=None, db_name=self.db_name)
+        self.assertEqual(pending.result(timeout=1), 1)
+        self.assertEqual(self.emails()[1], "first@example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
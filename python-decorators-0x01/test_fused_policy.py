@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test module for 7-fused_policy.py: db_policy against the stack"""
+
+import contextlib
+import importlib.util
+import io
+import itertools
+import os
+import unittest
+
+_spec = importlib.util.spec_from_file_location(
+    "fused_policy",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "7-fused_policy.py"))
+fused_policy = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fused_policy)
+
+FLAGS = ("connection", "transaction", "retries", "cache", "log")
+
+
+class FakeConnection:
+    """Records what the wrappers do to it"""
+
+    def __init__(self, events):
+        self.events = events
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+    def close(self):
+        self.events.append("close")
+
+
+def make_body(failures, events):
+    """Fails `failures` times, then returns what it was called with"""
+    state = {"calls": 0}
+
+    def body(conn, query):
+        state["calls"] += 1
+        events.append("call")
+        assert isinstance(conn, FakeConnection), conn
+        if state["calls"] <= failures:
+            raise RuntimeError(f"failure {state['calls']}")
+        return ("rows for", query)
+    return body
+
+
+def stacked(body, connection, transaction, retries, cache, log, connect):
+    """The decorators stacked in the order db_policy documents"""
+    func = body
+    if transaction:
+        func = fused_policy.transactional(func)
+    if retries:
+        func = fused_policy.retry_on_failure(retries, delay=0)(func)
+    if cache:
+        func = fused_policy.cache_query(func)
+    if connection:
+        func = fused_policy.with_db_connection(func, connect=connect)
+    if log:
+        func = fused_policy.log_queries(func)
+    return func
+
+
+def fused(body, connection, transaction, retries, cache, log, connect):
+    """The same policy through db_policy"""
+    return fused_policy.db_policy(
+        connection=connection, transaction=transaction, retries=retries,
+        delay=0, cache=cache, log=log, connect=connect)(body)
+
+
+def run(build, flags, failures):
+    """Call the wrapped body twice with one query; record everything
+    except the connections a cache hit did or did not open
+    """
+    fused_policy.query_cache.clear()
+    events = []
+    connect = lambda: FakeConnection(events)  # noqa: E731
+    func = build(make_body(failures, events), connect=connect, **flags)
+    outcomes = []
+    for query in ("SELECT 1", "SELECT 1", "SELECT 2"):
+        args = (query,) if flags["connection"] else (connect(), query)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                outcomes.append(("ok", func(*args)))
+        except RuntimeError as e:
+            outcomes.append(("error", str(e)))
+    return (outcomes, [e for e in events if e != "close"],
+            dict(fused_policy.query_cache))
+
+
+class TestDbPolicy(unittest.TestCase):
+    """Test that db_policy behaves like the stacked decorators"""
+
+    def test_every_combination(self):
+        """Test every flag combination, with and without failures"""
+        for values in itertools.product(
+                (True, False), (True, False), (None, 2),
+                (True, False), (True, False)):
+            flags = dict(zip(FLAGS, values))
+            for failures in (0, 1, 5):
+                with self.subTest(failures=failures, **flags):
+                    self.assertEqual(run(fused, flags, failures),
+                                     run(stacked, flags, failures))
+
+    def test_cache_without_connection(self):
+        """Test that the query, not the connection, is the cache key"""
+        conn = FakeConnection([])
+        fetch = fused_policy.db_policy(connection=False, cache=True)(
+            lambda conn, query: query)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(fetch(conn, "select * from users"),
+                             "select * from users")
+            self.assertEqual(fetch(conn, "select 42"), "select 42")
+        self.assertNotIn(conn, fused_policy.query_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test module for 6-query_plan_profiler.py"""
+
+import importlib.util
+import os
+import sqlite3
+import unittest
+
+_spec = importlib.util.spec_from_file_location(
+    "query_plan_profiler",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "6-query_plan_profiler.py"))
+profiler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(profiler)
+
+MISSING_INDEX = "missing index: WHERE clause is not served by an index"
+
+
+class TestExplain(unittest.TestCase):
+    """Flags raised by explain() on an unindexed table"""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    def flags(self, query, params=()):
+        return profiler.explain(self.conn, query, params)[1]
+
+    def test_where_after_any_whitespace(self):
+        """A WHERE next to a newline or tab is still a filtered query"""
+        for query in ("SELECT * FROM users WHERE email = ?",
+                      "SELECT * FROM users\nWHERE email = ?",
+                      "SELECT * FROM users\twhere\temail = ?"):
+            with self.subTest(query=query):
+                self.assertIn(MISSING_INDEX, self.flags(query, ("a",)))
+
+    def test_where_in_literal(self):
+        """A WHERE inside a string literal does not count"""
+        self.assertNotIn(MISSING_INDEX,
+                         self.flags("SELECT ' WHERE ' FROM users"))
+
+    def test_index_lookup_not_flagged(self):
+        """A primary-key lookup is neither a full scan nor missing an index"""
+        self.assertEqual(self.flags("SELECT * FROM users WHERE id = ?", (1,)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test module for 1-with_db_connection.py"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+    conn.executemany("INSERT INTO users VALUES (?, ?)",
+                     [(1, "a@example.com"), (2, "b@example.com")])
+    conn.commit()
+    conn.close()
+
+
+def load_module(directory):
+    # The module reads user 1 from ./database.db when it is loaded
+    spec = importlib.util.spec_from_file_location(
+        "with_db_connection", os.path.join(HERE, "1-with_db_connection.py"))
+    module = importlib.util.module_from_spec(spec)
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    module.close_connections()
+    return module
+
+
+class TestWithDbConnection(unittest.TestCase):
+    """Writer scopes and the reader pool"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        make_db(os.path.join(tmp.name, "database.db"))
+        self.db = load_module(tmp.name)
+        self.db.DB_NAME = os.path.join(tmp.name, "database.db")
+        self.addCleanup(self.db.close_connections)
+
+        @self.db.with_db_connection
+        def set_email(conn, user_id, email):
+            conn.execute("UPDATE users SET email = ? WHERE id = ?",
+                         (email, user_id))
+        self.set_email = set_email
+
+    def emails(self):
+        conn = sqlite3.connect(self.db.DB_NAME)
+        try:
+            return dict(conn.execute("SELECT id, email FROM users"))
+        finally:
+            conn.close()
+
+    def test_scope_commits_on_exit(self):
+        """Writes in a scope are committed when it exits"""
+        with self.db.request_scope():
+            self.set_email(1, "new@example.com")
+            self.assertEqual(self.db.get_user_by_id(1)[1], "new@example.com")
+        self.assertEqual(self.emails()[1], "new@example.com")
+
+    def test_nested_scope_rolled_back_by_outer(self):
+        """An inner scope does not commit the outer scope's writes"""
+        with self.assertRaises(RuntimeError):
+            with self.db.request_scope():
+                self.set_email(1, "outer@example.com")
+                with self.db.request_scope():
+                    self.set_email(2, "inner@example.com")
+                raise RuntimeError("outer scope fails")
+        self.assertEqual(self.emails(), {1: "a@example.com", 2: "b@example.com"})
+        # The writer lock was released, writes work again
+        self.set_email(1, "later@example.com")
+
+    def test_reader_pool_timeout(self):
+        """Waiting for a reader gives up after READER_TIMEOUT"""
+        self.db.READER_TIMEOUT = 0.05
+        readers = [self.db._acquire_reader()
+                   for _ in range(self.db.READER_POOL_SIZE)]
+        try:
+            with self.assertRaises(TimeoutError):
+                self.db._acquire_reader()
+        finally:
+            for conn in readers:
+                self.db._release_reader(conn)
+
+
+if __name__ == "__main__":
+    unittest.main()